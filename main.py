@@ -5,17 +5,32 @@
     Author: Israel Dryer
     Modified: 2020-06-07
 """
+import re
+import json
 import pathlib
+import time
 import datetime
+import functools
 import tkinter as tk
 from tkinter import font as tkfont
 from tkinter.scrolledtext import ScrolledText
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
 from widgets.texttools import Find, Replace
-from widgets.fontselect import FontSelector
+from widgets.fontselect import FontSelector, preload_families
 from widgets.about import AboutMe
 from widgets.ribbon import Ribbon
 from widgets.statusbar import StatusBar
+from widgets.session import Session
+from widgets.analytics import Analytics, SNAPSHOT_LINES
+from widgets.worker import run_in_thread
+from widgets.linenumbers import LineNumbers
+from widgets.multicursor import MultiCursor
+from widgets.structured import CsvView, format_json
+from widgets import clipboard
+from widgets.compare import CompareView
+from widgets import linetools
+from widgets.fileio import read_chunks, longest_line, insert_chunks, iter_content, LONG_LINE, SPLIT_WIDTH
+from widgets.fileio import detect_compression, write_compressed, iter_chunks, content_index, SUFFIXES
 
 class Notepad(tk.Tk):
     """A notepad application"""
@@ -28,11 +43,25 @@ class Notepad(tk.Tk):
         platform = self.tk.call('tk', 'windowingsystem')
         self.wm_state('zoomed') if platform == 'win32' else self.attributes('-zoomed', 1)
 
+        # restore the previous session
+        self.session = Session(self)
+        self.recent_files = self.session.get('recent', [])
+        self.find_history = self.session.get('find_history', [])
+
         # file variables
-        self.file = pathlib.Path.cwd() / 'untitled.txt'
+        self.file = pathlib.Path(self.session.get('file') or '')
+        if not self.file.is_file():  # the last file may have been moved or deleted since
+            self.file = pathlib.Path.cwd() / 'untitled.txt'
         self.file_defaults = {
             'defaultextension': 'txt', 
-            'filetypes': [('Text', ['txt', 'text']), ('All Files', '.*')]}
+            'filetypes': [('Text', ['txt', 'text']), ('Compressed', ['gz', 'bz2', 'xz']), ('All Files', '.*')]}
+        self.compression = None
+        self.save_thread = None
+        self.paste = None  # chunked paste, which may still be running
+
+        # document version, incremented on every change to the text, and the version last loaded or saved
+        self.version = 0
+        self.saved_version = None
 
         # find search replace variables
         self.query = None
@@ -54,6 +83,19 @@ class Notepad(tk.Tk):
         self.menu_file.add_command(label='Save', accelerator='Ctrl+S', command=self.save_file)
         self.menu_file.add_command(label='Save As...', command=self.save_file_as)
         self.menu_file.add_separator()
+        self.menu_file.add_command(label='Compare...', command=self.ask_compare)
+        self.menu_file.add_separator()
+        self.menu_recent = tk.Menu(self.menu_file, tearoff=False)
+        self.menu_file.add_cascade(label='Recent Files', menu=self.menu_recent)
+        self.update_recent_menu()
+        self.level_var = tk.IntVar()
+        self.level_var.set(self.session.get('level', 6))
+        self.menu_level = tk.Menu(self.menu_file, tearoff=False)
+        for level, label in ((1, 'Fastest'), (6, 'Default'), (9, 'Best')):
+            self.menu_level.add_radiobutton(label=f'{level} - {label}', value=level, variable=self.level_var,
+                                            command=self.session.schedule_save)
+        self.menu_file.add_cascade(label='Compression Level', menu=self.menu_level)
+        self.menu_file.add_separator()
         self.menu_file.add_command(label='Exit', command=self.quit_application)
 
         # edit menu
@@ -68,17 +110,44 @@ class Notepad(tk.Tk):
         self.menu_edit.add_command(label='Replace', accelerator='Ctrl+H', command=self.ask_find_replace)
         self.menu_edit.add_separator()
         self.menu_edit.add_command(label='Select All', accelerator='Ctrl+A', command=self.select_all)
+        self.menu_lines = tk.Menu(self.menu_edit, tearoff=False)
+        self.menu_lines.add_command(label='Sort', command=lambda: self.lines_sort('lexical'))
+        self.menu_lines.add_command(label='Sort Numeric', command=lambda: self.lines_sort('numeric'))
+        self.menu_lines.add_command(label='Sort Natural', command=lambda: self.lines_sort('natural'))
+        self.menu_lines.add_separator()
+        self.menu_lines.add_command(label='Remove Duplicates', command=self.lines_unique)
+        self.menu_lines.add_separator()
+        self.menu_lines.add_command(label='Keep Matching...', command=lambda: self.lines_filter(True))
+        self.menu_lines.add_command(label='Remove Matching...', command=lambda: self.lines_filter(False))
+        self.menu_edit.add_cascade(label='Lines', menu=self.menu_lines)
         self.menu_edit.add_command(label='Time/Date', accelerator='F5', command=self.get_datetime)
+        self.menu_edit.add_separator()
+        self.menu_edit.add_command(label='Statistics...', command=self.ask_analytics)
 
         # format menu
         self.wrap_var = tk.IntVar()
-        self.wrap_var.set(True)
+        self.wrap_var.set(self.session.get('wrap', True))
         self.block_var = tk.IntVar()
-        self.block_var.set(False)
+        self.block_var.set(self.session.get('block', False))
+        self.numbers_var = tk.IntVar()
+        self.numbers_var.set(self.session.get('numbers', False))
         self.menu_format.add_checkbutton(label='Word Wrap', variable=self.wrap_var, command=self.word_wrap)
         self.menu_format.add_checkbutton(label='Block Cursor', variable=self.block_var, command=self.block_cursor)
+        self.menu_format.add_checkbutton(label='Line Numbers', variable=self.numbers_var, command=self.line_numbers)
+        self.menu_format.add_separator()
+        self.long_var = tk.IntVar()
+        self.long_var.set(False)
+        self.split_var = tk.IntVar()
+        self.split_var.set(self.session.get('split', True))
+        self.menu_format.add_checkbutton(label='Long Line Mode', variable=self.long_var, command=self.long_line_mode)
+        self.menu_format.add_checkbutton(label='Split Long Lines', variable=self.split_var,
+                                         command=self.session.schedule_save)
         self.menu_format.add_separator()
         self.menu_format.add_command(label='Font...', command=self.ask_font_select)
+        self.menu_format.add_separator()
+        self.menu_format.add_command(label='Format JSON', command=lambda: self.json_format(4))
+        self.menu_format.add_command(label='Minify JSON', command=lambda: self.json_format(None))
+        self.menu_format.add_command(label='CSV Table View...', command=self.ask_csv_view)
 
         # help menu
         self.menu_help.add_command(label='View Help', state=tk.DISABLED, command=None)
@@ -95,15 +164,25 @@ class Notepad(tk.Tk):
 
         # setup text text widget
         self.text_frame = tk.Frame(self)
-        self.text = ScrolledText(self.text_frame, wrap=tk.WORD, font='-size 14', undo=True, maxundo=10,
-            autoseparator=True, blockcursor=False, padx=5, pady=10)
+        self.text = ScrolledText(self.text_frame, wrap=tk.WORD if self.wrap_var.get() else tk.NONE, font='-size 14',
+            undo=True, maxundo=10, autoseparator=True, blockcursor=bool(self.block_var.get()), padx=5, pady=10)
          
         # set default tab size to 4 characters
         self.font = tkfont.Font(family='Courier New', size=12, weight=tkfont.NORMAL, slant=tkfont.ROMAN, underline=False, overstrike=False)        
+        try:
+            self.font.configure(**self.session.get('font', {}))
+        except (tk.TclError, TypeError):
+            pass
         self.text.configure(font=self.font)
-        tab_width = self.font.measure(' ' * 4)
-        self.text.configure(tabs=(tab_width,))
-        self.text.insert(tk.END, self.file.read_text() if self.file.is_file() else '')
+        self.update_tab_width()
+
+        # column selection and multiple cursors
+        self.multicursor = MultiCursor(self.text)
+
+        # line number gutter
+        self.gutter = LineNumbers(self.text.frame, self.text)
+        if self.numbers_var.get():
+            self.gutter.show()
 
         # pack all widget to screen
         self.text.pack(fill=tk.BOTH, expand=tk.YES)
@@ -116,12 +195,30 @@ class Notepad(tk.Tk):
         self.bind("<Control-f>", self.ask_find_next)
         self.bind("<Control-h>", self.ask_find_replace)
         self.bind("<F5>", self.get_datetime)
+        self.bind("<<FontChanged>>", self.update_tab_width)
+        self.bind("<<FontChanged>>", self.gutter.refresh, add='+')
+        self.text.bind("<<Modified>>", self.on_modified, add='+')
+        self.text.bind("<<Paste>>", self.text_paste, add='+')
+        self.text.bind("<<Copy>>", self.text_copy, add='+')
+        self.text.bind("<<Cut>>", self.text_cut, add='+')
+        self.bind("<<FontChanged>>", self.session.schedule_save, add='+')
+        self.bind("<<FindHistoryChanged>>", self.session.schedule_save)
+        self.bind("<<BeforeReplace>>", lambda event: self.stop_paste())
+        self.text.bind("<KeyRelease>", self.session.schedule_save, add='+')
+        self.text.bind("<ButtonRelease>", self.session.schedule_save, add='+')
+        self.text.bind("<MouseWheel>", self.session.schedule_save, add='+')
+        self.protocol("WM_DELETE_WINDOW", self.quit_application)
 
         # final setup
         self.update_title()
 
         #self.eval('tk::PlaceWindow . center')
         self.deiconify()
+        preload_families(self)
+
+        # load the file content after the window is drawn
+        if self.file.is_file():
+            self.after_idle(self.load_file, self.file, self.session.get('cursor'), self.session.get('yview'))
 
     #---FILE MENU CALLBACKS------------------------------------------------------------------------
 
@@ -131,9 +228,15 @@ class Notepad(tk.Tk):
         self.confirm_changes()
 
         # reset text widget
+        self.stop_paste(complete=False)
+        self.multicursor.clear()
         self.text.delete(1.0, tk.END)
         self.file = pathlib.Path.cwd() / 'untitled.txt'
+        self.compression = None
+        self.long_var.set(False)
+        self.long_line_mode()
         self.update_title()
+        self.session.schedule_save()
 
     def open_file(self):
         """Open an existing file"""
@@ -143,33 +246,124 @@ class Notepad(tk.Tk):
         # open new file
         file = filedialog.askopenfilename(initialdir=self.file.parent, **self.file_defaults)
         if file:
-            self.text.delete(1.0, tk.END)  # delete existing content
-            self.file = pathlib.Path(file)
-            self.text.insert(tk.END, self.file.read_text())
-            self.update_title()
-            self.status_bar.update_status()
+            self.load_file(pathlib.Path(file))
+
+    def open_recent(self, file):
+        """Open a file from the recent files menu"""
+        self.confirm_changes()
+        file = pathlib.Path(file)
+        if file.is_file():
+            self.load_file(file)
+        else:
+            messagebox.showerror(message=f"Cannot find {file}")
+            self.recent_files.remove(str(file))
+            self.update_recent_menu()
+            self.session.schedule_save()
+
+    def load_file(self, file, cursor=None, yview=None):
+        """Replace the text widget content with a file and restore the cursor and scroll position"""
+        # very long lines make the text layout slow; offer to open the file in long line mode
+        long_lines = longest_line(file) > LONG_LINE and messagebox.askyesno(
+            message=f"{file.name} contains very long lines.\n\nOpen it in long line mode? "
+                    "Word wrap and the character and word counts are turned off.")
+        self.long_var.set(long_lines)
+        self.long_line_mode()
+
+        self.stop_paste(complete=False)
+        self.multicursor.clear()
+        self.text.delete(1.0, tk.END)  # delete existing content
+        self.file = file
+        self.compression = detect_compression(file)
+        started = time.perf_counter()
+        split_width = SPLIT_WIDTH if long_lines and self.split_var.get() else None
+        insert_chunks(self.text, read_chunks(self.file), split_width)
+        self.text.edit_reset()
+        if self.compression:
+            size = self.file.stat().st_size
+            self.status_bar.set_message(f'{self.compression}: {size:,d} bytes on disk, '
+                                        f'opened in {time.perf_counter() - started:.2f}s')
+        else:
+            self.status_bar.set_message()
+        if cursor:
+            self.text.mark_set(tk.INSERT, cursor)
+            self.text.see(tk.INSERT)
+        if yview is not None:
+            self.text.yview_moveto(yview)
+        self.mark_saved()
+        self.add_recent_file()
+        self.update_title()
+        self.status_bar.update_status()
 
     def save_file(self):
         """Save the currently open file"""
         if self.file.name == 'untitled.txt':
             file = filedialog.asksaveasfilename(initialfile=self.file, **self.file_defaults)
             self.file = pathlib.Path(file) if file else self.file
-        self.file.write_text(self.text.get(1.0, tk.END))
+            self.compression = SUFFIXES.get(self.file.suffix.lower())
+        self.write_file()
 
     def save_file_as(self):
         """Save the currently open file with a different name or location"""
         file = filedialog.asksaveasfilename(initialdir=self.file.parent, **self.file_defaults)
         if file:
             self.file = pathlib.Path(file)
-            self.file.write_text(self.text.get(1.0, tk.END))
+            self.compression = SUFFIXES.get(self.file.suffix.lower())
+            self.write_file()
             self.update_title()
 
+    def write_file(self):
+        """Write the text widget content to the current file, leaving out display-only line breaks"""
+        self.stop_paste()
+        if self.compression is None:
+            with open(self.file, 'w') as f:
+                f.writelines(iter_content(self.text, '1.0', 'end-1c'))
+            self.mark_saved()
+            self.add_recent_file()
+            return
+
+        # compressed files are written in the background from a snapshot of the content
+        self.wait_for_save()
+        text = ''.join(iter_content(self.text, '1.0', 'end-1c'))
+        compression = self.compression
+        self.on_modified()  # count edits whose <<Modified>> event is still queued
+        version = self.version
+
+        def done(stats):
+            self.saved_version = version
+            self.add_recent_file()
+            raw, packed, seconds = stats
+            ratio = packed / raw if raw else 0
+            self.status_bar.set_message(f'{compression}: {raw:,d} -> {packed:,d} bytes ({ratio:.1%}) '
+                                        f'saved in {seconds:.2f}s')
+
+        def failed(error):
+            self.status_bar.set_message()
+            messagebox.showerror(message=f"Could not save {self.file.name}: {error}")
+
+        self.status_bar.set_message(f'Compressing {self.file.name}...')
+        self.save_thread = run_in_thread(self, write_compressed, (self.file, text, compression,
+                                                                  self.level_var.get()), done, failed)
+
+    def wait_for_save(self):
+        """Block until a background save has finished and report its result; False if it failed"""
+        if self.save_thread is None:
+            return True
+        thread, self.save_thread = self.save_thread, None
+        return thread.finish()
+
+    def ask_compare(self):
+        """Compare the current document with another file"""
+        file = filedialog.askopenfilename(initialdir=self.file.parent, **self.file_defaults)
+        if file:
+            CompareView(self, ''.join(iter_content(self.text, '1.0', 'end-1c')), self.file.name, file)
+
     def confirm_changes(self):
         """Check to see if content has changed from original file; if so, confirm save"""
+        self.stop_paste()
+        self.wait_for_save()
         if self.file.is_file():
-            original = self.file.read_text()
-            current = self.text.get(1.0, tk.END)
-            if original != current:
+            self.on_modified()  # count edits whose <<Modified>> event is still queued
+            if self.version != self.saved_version:
                 confirm = messagebox.askyesno(message="Save current file changes?")
                 if confirm:
                     self.save_file()
@@ -179,19 +373,58 @@ class Notepad(tk.Tk):
             if confirm:
                 self.save_file()
 
+    def mark_saved(self):
+        """Remember the document version that matches the file on disk"""
+        self.on_modified()  # count edits whose <<Modified>> event is still queued
+        self.saved_version = self.version
+
     def quit_application(self):
         """Quit application after checking for user changes"""
         self.confirm_changes()
+        if not self.wait_for_save():
+            return  # the error has been shown; stay open so the changes are not lost
+        self.session.save_now()
         self.destroy()
 
     def update_title(self):
         """Update the title with the file name"""
         self.title(self.file.name + " - Notepad")
 
+    def add_recent_file(self):
+        """Add the current file to the recent files list"""
+        if self.file.is_file():
+            Session.add_recent(self.recent_files, str(self.file))
+            self.update_recent_menu()
+            self.session.schedule_save()
+
+    def update_recent_menu(self):
+        """Rebuild the recent files menu"""
+        self.menu_recent.delete(0, tk.END)
+        for file in self.recent_files:
+            self.menu_recent.add_command(label=file, command=lambda f=file: self.open_recent(f))
+        if not self.recent_files:
+            self.menu_recent.add_command(label='(empty)', state=tk.DISABLED)
+
+    def get_session_state(self):
+        """Return the editor state that is saved between sessions"""
+        return {
+            'file': str(self.file) if self.file.is_file() else None,
+            'cursor': self.text.index(tk.INSERT),
+            'yview': self.text.yview()[0],
+            'wrap': self.wrap_var.get(),
+            'block': self.block_var.get(),
+            'numbers': self.numbers_var.get(),
+            'split': self.split_var.get(),
+            'level': self.level_var.get(),
+            'font': self.font.configure(),
+            'recent': self.recent_files,
+            'find_history': self.find_history}
+
     #---EDIT MENU CALLBACKS------------------------------------------------------------------------
 
     def undo_edit(self):
         """Undo the last edit in the stack"""
+        self.stop_paste()
         try:
             self.text.edit_undo()
         except tk.TclError:
@@ -199,42 +432,146 @@ class Notepad(tk.Tk):
 
     def redo_edit(self):
         """Redo the last edit in the stack"""
+        self.stop_paste()
         try:
             self.text.edit_redo()
         except tk.TclError:
             pass
 
-    def text_copy(self):
+    def text_copy(self, event=None):
         """Append selected text to the clipboard"""
-        selected = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
-        self.text.clipboard_clear()
-        self.text.clipboard_append(selected)
+        if not self.multicursor.copy():
+            clipboard.copy(self.text)
+        return 'break'
 
-    def text_paste(self):
-        """Paste clipboard text into text widget at cursor"""
-        self.text.insert(tk.INSERT, self.text.clipboard_get())
+    def text_paste(self, event=None):
+        """Paste clipboard text into text widget at cursor; large payloads are pasted in chunks"""
+        if self.multicursor.paste() or (self.paste is not None and self.paste.running):
+            return 'break'
 
-    def text_cut(self):
+        def progress(fraction):
+            self.status_bar.set_message(f'Pasting... {fraction:.0%}')
+
+        def done():
+            self.status_bar.set_message()
+            self.status_bar.update_status()
+
+        # keyboard pastes replace the selection like the default binding does outside of X11
+        replace = event is not None and self.tk.call('tk', 'windowingsystem') != 'x11'
+        self.paste = clipboard.ChunkedPaste(self.text, progress, done, replace_selection=replace)
+        return 'break'
+
+    def stop_paste(self, complete=True):
+        """Complete (or cancel) a chunked paste that is still running, before the text is edited"""
+        if self.paste is not None and self.paste.running:
+            if complete:
+                self.paste.complete()
+            else:
+                self.paste.cancel()
+
+    def text_cut(self, event=None):
         """Cut selected text and append to clipboard"""
-        selected = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
-        self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
-        self.text.clipboard_clear()
-        self.text.clipboard_append(selected)
+        self.stop_paste()
+        if not self.multicursor.cut():
+            clipboard.cut(self.text)
+        return 'break'
 
     def ask_find_next(self, event=None):
         """Create find next popup widget"""
-        self.findnext = Find(self, self.text)
+        self.findnext = Find(self, self.text, self.find_history)
 
     def ask_find_replace(self, event=None):
         """Create replace popup widget"""
-        self.findreplace = Replace(self, self.text)        
+        self.findreplace = Replace(self, self.text, self.find_history)
 
     def select_all(self):
         """Select all text in the text widget"""
         self.text.tag_add(tk.SEL, '1.0', tk.END)
 
+    def ask_analytics(self):
+        """Create document statistics popup widget"""
+        Analytics(self, self.text)
+
+    def lines_sort(self, mode):
+        """Sort the selected lines, or all lines, in a worker thread"""
+        func = functools.partial(linetools.sort_lines, key=linetools.SORT_KEYS[mode])
+        self.run_lines_task(func, 'Sorting lines...')
+
+    def lines_unique(self):
+        """Remove duplicate lines from the selection or the whole document"""
+        self.run_lines_task(linetools.unique_lines, 'Removing duplicate lines...')
+
+    def lines_filter(self, keep):
+        """Keep or remove the lines matching a regular expression"""
+        title = 'Keep Matching Lines' if keep else 'Remove Matching Lines'
+        pattern = simpledialog.askstring(title, 'Regular expression:', parent=self)
+        if not pattern:
+            return
+        try:
+            re.compile(pattern)
+        except re.error as error:
+            messagebox.showerror(message=f"Invalid pattern: {error}")
+            return
+        func = functools.partial(linetools.filter_lines, pattern=pattern, keep=keep)
+        self.run_lines_task(func, 'Filtering lines...')
+
+    def run_lines_task(self, func, message):
+        """Snapshot the target lines, process them in a worker thread and apply the result as one edit"""
+        if self.text.tag_ranges(tk.SEL):
+            start = self.text.index(tk.SEL_FIRST + ' linestart')
+            end = self.text.index(tk.SEL_LAST)
+            if not end.endswith('.0'):
+                end = self.text.index(end + ' lineend')
+        else:
+            start, end = '1.0', self.text.index('end-1c')
+        # the lines go through temporary files, copied from the widget a block of lines at a time, so
+        # that no full copy of a huge range is held in memory
+        source = linetools.temporary_file()
+        index = start
+        while self.text.compare(index, '<', end):
+            stop = self.text.index(f'{index} +{SNAPSHOT_LINES} lines linestart')
+            if self.text.compare(stop, '<=', index) or self.text.compare(stop, '>', end):
+                stop = end
+            source.writelines(iter_content(self.text, index, stop))
+            index = stop
+        source.seek(0)
+        target = linetools.temporary_file()
+        version = self.version
+
+        def apply(result):
+            source.close()
+            self.status_bar.set_message()
+            with result:
+                if self.version != version:
+                    messagebox.showwarning(message="The document changed while the lines were processed.")
+                    return
+                self.replace_range(start, end, iter_chunks(result))
+
+        def failed(error):
+            source.close()
+            target.close()
+            self.status_bar.set_message()
+            messagebox.showerror(message=str(error))
+
+        self.status_bar.set_message(message)
+        run_in_thread(self, linetools.process_file, (source, target, func), apply, failed)
+
+    def replace_range(self, start, end, chunks):
+        """Replace a range of the text widget with chunks of text as a single undoable edit"""
+        split_width = SPLIT_WIDTH if self.long_var.get() and self.split_var.get() else None
+        self.stop_paste()
+        self.text.configure(autoseparators=False)
+        self.text.edit_separator()
+        self.text.delete(start, end)
+        insert_chunks(self.text, chunks, split_width, start)
+        self.text.edit_separator()
+        self.text.configure(autoseparators=True)
+        self.text.mark_set(tk.INSERT, start)
+        self.text.see(tk.INSERT)
+
     def get_datetime(self, event=None):
         """insert date and time at cursor position"""
+        self.stop_paste()
         self.text.insert(tk.INSERT, datetime.datetime.now().strftime("%c"))
 
     #---FORMAT MENU CALLBACKS------------------------------------------------------------------------
@@ -246,6 +583,7 @@ class Notepad(tk.Tk):
             self.text.configure(wrap=tk.WORD)
         else:
             self.text.configure(wrap=tk.NONE)
+        self.session.schedule_save()
 
     def block_cursor(self):
         """Toggle word wrap in text widget"""
@@ -253,14 +591,78 @@ class Notepad(tk.Tk):
             self.text.configure(blockcursor=True)
         else:
             self.text.configure(blockcursor=False)
+        self.session.schedule_save()
+
+    def line_numbers(self):
+        """Toggle the line number gutter"""
+        if self.numbers_var.get():
+            self.gutter.show()
+        else:
+            self.gutter.hide()
+        self.session.schedule_save()
+
+    def long_line_mode(self):
+        """Toggle the settings used for files with very long lines"""
+        if self.long_var.get():
+            self.text.configure(wrap=tk.NONE)
+            self.status_bar.set_counting(False)
+        else:
+            self.text.configure(wrap=tk.WORD if self.wrap_var.get() else tk.NONE)
+            self.status_bar.set_counting(True)
 
     def ask_font_select(self):
         """Font selector popup"""
-        f = FontSelector(self)
+        FontSelector(self)
+
+    def json_format(self, indent):
+        """Pretty-print or minify the JSON document in a worker thread"""
+        snapshot = ''.join(iter_content(self.text, '1.0', 'end-1c'))
+        version = self.version
+
+        def apply(result):
+            self.status_bar.set_message()
+            if self.version != version:
+                messagebox.showwarning(message="The document changed while the JSON was formatted.")
+                return
+            if indent is None and len(result) > LONG_LINE and not self.long_var.get():
+                # minified JSON is one long line; show it like a long line file
+                self.long_var.set(True)
+                self.long_line_mode()
+            self.replace_range('1.0', 'end-1c', [result])
+
+        def failed(error):
+            self.status_bar.set_message()
+            if isinstance(error, json.JSONDecodeError) and self.version == version:
+                self.text.mark_set(tk.INSERT, content_index(self.text, error.pos))
+                self.text.see(tk.INSERT)
+                self.status_bar.update_status()
+            messagebox.showerror(message=f"Invalid JSON: {error}")
+
+        self.status_bar.set_message('Formatting JSON...')
+        run_in_thread(self, format_json, (snapshot, indent), apply, failed)
+
+    def ask_csv_view(self):
+        """Open a CSV file, by default the current one, in the table view"""
+        if self.file.suffix.lower() in ('.csv', '.tsv') and self.file.is_file() and not self.compression:
+            file = self.file
+        else:
+            file = filedialog.askopenfilename(initialdir=self.file.parent,
+                                              filetypes=[('CSV', ['csv', 'tsv']), ('All Files', '.*')])
+        if file:
+            CsvView(self, file)
+
+    def update_tab_width(self, event=None):
+        """Set the tab size to 4 characters of the current font"""
         tab_width = self.font.measure(' ' * 4)
-        self.text.configure(tabs=(tab_width,))        
+        self.text.configure(tabs=(tab_width,))
 
     #---OTHER--------------------------------------------------------------------------------------
+    def on_modified(self, event=None):
+        """Count document changes; the modified flag is reset so the next change fires again"""
+        if self.text.edit_modified():
+            self.version += 1
+            self.text.edit_modified(False)
+
     def about_me(self):
         """Application and license info"""
         AboutMe(self)
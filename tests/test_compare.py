@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from widgets import compare
+
+
+def lcs_length(a, b):
+    """Length of the longest common subsequence, by dynamic programming"""
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def apply_opcodes(a, b, codes):
+    """Rebuild b from a and the opcodes, checking that they cover both sequences in order"""
+    out = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in codes:
+        assert (i1, j1) == (i, j)
+        if tag == 'equal':
+            assert list(a[i1:i2]) == list(b[j1:j2])
+            out.extend(a[i1:i2])
+        else:
+            assert tag == {(True, True): 'replace', (True, False): 'delete', (False, True): 'insert'}[
+                (i2 > i1, j2 > j1)]
+            out.extend(b[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return out
+
+
+def random_pair(rng, size=30, alphabet=4):
+    a = [rng.randrange(alphabet) for _ in range(rng.randint(0, size))]
+    b = [rng.randrange(alphabet) for _ in range(rng.randint(0, size))]
+    return a, b
+
+
+@pytest.mark.parametrize('cost', [2, 3, 5, compare.MAX_EDIT_COST])
+def test_opcodes_are_valid(monkeypatch, cost):
+    monkeypatch.setattr(compare, 'MAX_EDIT_COST', cost)
+    rng = random.Random(cost)
+    for _ in range(500):
+        a, b = random_pair(rng)
+        codes = compare.opcodes(a, b)
+        assert apply_opcodes(a, b, codes) == b
+        matched = sum(i2 - i1 for tag, i1, i2, _, _ in codes if tag == 'equal')
+        assert matched <= lcs_length(a, b)
+
+
+def test_myers_is_optimal_within_the_cost_limit():
+    rng = random.Random(36)
+    for _ in range(500):
+        a, b = random_pair(rng)
+        blocks = []
+        compare.myers(a, b, 0, len(a), 0, len(b), blocks)
+        assert sum(size for _, _, size in blocks) == lcs_length(a, b)
+
+
+def test_expensive_region_is_split(monkeypatch):
+    monkeypatch.setattr(compare, 'MAX_EDIT_COST', 20)
+    rng = random.Random(1)
+    a = [rng.randrange(3) for _ in range(2000)]
+    b = list(a)
+    for i in range(0, len(b), 100):
+        b[i] = 99
+    codes = compare.opcodes(a, b)
+    assert apply_opcodes(a, b, codes) == b
+    assert max(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in codes if tag != 'equal') < 50
+
+
+def test_compare_aligns_both_sides(tmp_path):
+    right = tmp_path / 'right.txt'
+    right.write_text('a\nB\nc\nd\nnew')
+    left, right_text, hunks, _ = compare.compare('a\nb\nc\nd', right)
+    assert left.split('\n') == ['a', 'b', 'c', 'd', '']
+    assert right_text.split('\n') == ['a', 'B', 'c', 'd', 'new']
+    assert hunks == [(2, 3, 'replace', 1, 1), (5, 6, 'insert', 0, 1)]
@@ -0,0 +1,75 @@
+import io
+import random
+
+from widgets import linetools
+
+
+def process(text, func, *args, **kwargs):
+    """Run a line function over text through process_file"""
+    return linetools.process_file(io.StringIO(text), io.StringIO(), func, *args, **kwargs).read()
+
+
+def test_sort_lexical():
+    assert list(linetools.sort_lines(['b', 'c', 'a'])) == ['a', 'b', 'c']
+
+
+def test_sort_numeric():
+    lines = ['10 ten', 'none', '-2', '3.5', '1e2']
+    result = list(linetools.sort_lines(lines, key=linetools.numeric_key))
+    assert result == ['-2', '3.5', '10 ten', '1e2', 'none']
+
+
+def test_sort_natural():
+    lines = ['file10', 'File9', 'file1']
+    assert list(linetools.sort_lines(lines, key=linetools.natural_key)) == ['file1', 'File9', 'file10']
+
+
+def test_sort_is_stable():
+    lines = ['2 b', '1 a', '2 a', '1 b']
+    result = list(linetools.sort_lines(lines, key=linetools.numeric_key))
+    assert result == ['1 a', '1 b', '2 b', '2 a']
+
+
+def test_sort_spill_matches_memory_sort():
+    rng = random.Random(30)
+    lines = [''.join(rng.choice('ab1 ') for _ in range(rng.randint(0, 6))) for _ in range(500)]
+    for key in linetools.SORT_KEYS.values():
+        assert list(linetools.sort_lines(lines, key=key, budget=16)) == sorted(lines, key=key)
+
+
+def test_sort_spill_keeps_carriage_returns():
+    lines = ['b\rx', 'a', 'c', 'd\r', '\r']
+    assert list(linetools.sort_lines(lines, budget=2)) == sorted(lines)
+
+
+def test_sort_spill_is_stable():
+    lines = [f'{i % 3} {i}' for i in range(100)]
+    result = list(linetools.sort_lines(lines, key=linetools.numeric_key, budget=8))
+    assert result == sorted(lines, key=linetools.numeric_key)
+
+
+def test_unique_keeps_first_occurrence():
+    assert list(linetools.unique_lines(['b', 'a', 'b', '', 'a', ''])) == ['b', 'a', '']
+
+
+def test_filter_keep_and_remove():
+    lines = ['error: disk', 'info: ok', 'ERROR: net']
+    assert list(linetools.filter_lines(lines, 'error')) == ['error: disk']
+    assert list(linetools.filter_lines(lines, '(?i)error', keep=False)) == ['info: ok']
+
+
+def test_process_file_trailing_newline():
+    assert process('b\na\n', linetools.sort_lines) == 'a\nb\n'
+    assert process('b\na', linetools.sort_lines) == 'a\nb'
+    assert process('', linetools.sort_lines) == ''
+    assert process('a\n', linetools.filter_lines, 'x') == '\n'
+
+
+def test_process_file_with_spill():
+    text = ''.join(f'{i}\r\n' for i in range(50, 0, -1))
+    result = process(text, linetools.sort_lines, key=linetools.numeric_key, budget=10)
+    assert result == ''.join(f'{i}\r\n' for i in range(1, 51))
+
+
+def test_process_file_unique():
+    assert process('a\nb\na\nb', linetools.unique_lines) == 'a\nb'
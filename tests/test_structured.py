@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import random
+
+import pytest
+
+from widgets.structured import format_json, index_rows
+
+
+def rows_at_offsets(path, dialect=csv.excel):
+    """Parse each indexed row on its own, the way the table view reads them"""
+    offsets, size = index_rows(path, dialect)
+    data = path.read_bytes()
+    bounds = list(offsets) + [size]
+    return [next(csv.reader(io.StringIO(data[start:end].decode(), newline=''), dialect), [])
+            for start, end in zip(bounds, bounds[1:])]
+
+
+def test_format_json_pretty():
+    assert format_json('{"a":[1,{}],"b":[]}') == '{\n    "a": [\n        1,\n        {}\n    ],\n    "b": []\n}'
+
+
+def test_format_json_minify():
+    assert format_json('{ "a" : [ 1 , 2 ] ,\n "b" : "x y" }', indent=None) == '{"a":[1,2],"b":"x y"}'
+
+
+def test_format_json_keeps_literals():
+    text = '{"n": 1.10, "e": 2E+05, "z": -0, "s": "a\\"b\\u00e9,:[]"}'
+    assert format_json(text, indent=None) == text.replace(' ', '')
+    assert json.loads(format_json(text)) == json.loads(text)
+
+
+def test_format_json_invalid():
+    with pytest.raises(json.JSONDecodeError) as error:
+        format_json('{"a": 1,\n "b": }')
+    assert (error.value.lineno, error.value.colno) == (2, 7)
+
+
+def test_index_rows_plain(tmp_path):
+    path = tmp_path / 'plain.csv'
+    path.write_bytes(b'a,b\n1,2\n3,4')
+    offsets, size = index_rows(path)
+    assert list(offsets) == [0, 4, 8] and size == 11
+
+
+def test_index_rows_quoted_newline(tmp_path):
+    path = tmp_path / 'quoted.csv'
+    path.write_bytes(b'a,b\n"x\ny",1\n"he said ""hi""\n",2\n3,4\n')
+    assert rows_at_offsets(path) == [['a', 'b'], ['x\ny', '1'], ['he said "hi"\n', '2'], ['3', '4']]
+
+
+def test_index_rows_literal_quote_in_unquoted_field(tmp_path):
+    path = tmp_path / 'inches.csv'
+    path.write_bytes(b'size,item\n5" pipe,1\n3,4\n')
+    assert rows_at_offsets(path) == [['size', 'item'], ['5" pipe', '1'], ['3', '4']]
+
+
+def test_index_rows_dialect_quotechar(tmp_path):
+    class Dialect(csv.excel):
+        delimiter = ';'
+        quotechar = "'"
+
+    path = tmp_path / 'single.csv'
+    path.write_bytes(b"a;b\n'x\ny';\"\n1;2\n")
+    assert rows_at_offsets(path, Dialect) == [['a', 'b'], ['x\ny', '"'], ['1', '2']]
+
+
+def test_index_rows_matches_csv_reader(tmp_path):
+    rng = random.Random(34)
+    rows = [[''.join(rng.choice('ab ,"\n') for _ in range(rng.randint(0, 5))) for _ in range(3)]
+            for _ in range(300)]
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    path = tmp_path / 'random.csv'
+    path.write_bytes(buffer.getvalue().encode())
+    assert rows_at_offsets(path) == rows
@@ -0,0 +1,227 @@
+"""
+    Document statistics popup computed in a worker thread
+"""
+import re
+import time
+import queue
+import threading
+import collections
+import tkinter as tk
+from tkinter import ttk
+from widgets.fileio import iter_content
+
+WORD_RE = re.compile(r"\w+(?:['’]\w+)*")
+WORDS_PER_MINUTE = 238
+SNAPSHOT_LINES = 20000  # lines copied from the text widget per event loop iteration
+TOP_WORDS = 50
+STOP = object()  # tells a worker to abandon its snapshot
+
+# analysis results of each text widget, keyed by widget name -> (document version, results)
+_cache = {}
+
+
+class Analyzer:
+    """Streaming tokenizer that accumulates document statistics from text chunks"""
+
+    def __init__(self):
+        self.chars = 0
+        self.lines = 1
+        self.line_length = 0
+        self.longest = (0, 1)  # length, line number
+        self.words = 0
+        self.counter = collections.Counter()
+        self.tail = ''
+
+    def feed(self, chunk):
+        """Add the next chunk of text"""
+        self.chars += len(chunk)
+        # line statistics
+        parts = chunk.split('\n')
+        self.line_length += len(parts[0])
+        for part in parts[1:]:
+            if self.line_length > self.longest[0]:
+                self.longest = (self.line_length, self.lines)
+            self.lines += 1
+            self.line_length = len(part)
+
+        # hold back a trailing partial word until the next chunk arrives
+        chunk = self.tail + chunk
+        if chunk and not chunk[-1].isspace():
+            *head, self.tail = chunk.rsplit(None, 1)
+            chunk = head[0] if head else ''
+        else:
+            self.tail = ''
+        self.count_words(chunk)
+
+    def count_words(self, text):
+        """Tokenize and count the words in a piece of text"""
+        # words never span whitespace, so count the whitespace separated tokens first and only run
+        # the word pattern once per distinct token
+        for token, count in collections.Counter(text.lower().split()).items():
+            for word in WORD_RE.findall(token):
+                self.words += count
+                self.counter[word] += count
+
+    def results(self):
+        """Finish the stream and return the statistics"""
+        self.count_words(self.tail)
+        self.tail = ''
+        if self.line_length > self.longest[0]:
+            self.longest = (self.line_length, self.lines)
+        return {
+            'chars': self.chars,
+            'words': self.words,
+            'lines': self.lines,
+            'longest': self.longest,
+            'reading': self.words / WORDS_PER_MINUTE,
+            'top': self.counter.most_common(TOP_WORDS)}
+
+
+class Analytics(tk.Toplevel):
+    """Show word, line and frequency statistics of the text widget content
+
+    Results are cached against `master.version`, a counter the master increments on every change to
+    the document, so that re-opening the window for an unchanged document is instant.
+    """
+
+    def __init__(self, master, text_widget):
+        super().__init__(master)
+        self.text = text_widget
+        self.version = master.version
+        self.title('Statistics')
+        self.transient(master)
+        self.resizable(False, False)
+        self.wm_attributes('-topmost', 'true', '-toolwindow', 'true')
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.focus_set()
+
+        # create widgets
+        self.vars = {}
+        labels = [('words', 'Words:'), ('chars', 'Characters:'), ('lines', 'Lines:'),
+                  ('longest', 'Longest line:'), ('reading', 'Reading time:')]
+        for row, (key, label) in enumerate(labels):
+            self.vars[key] = tk.StringVar()
+            self.vars[key].set('-')
+            tk.Label(self, text=label, anchor=tk.W).grid(row=row, column=0, sticky=tk.EW, padx=(15, 5))
+            tk.Label(self, textvariable=self.vars[key], anchor=tk.E).grid(row=row, column=1, sticky=tk.EW, padx=(5, 15))
+        self.top = ttk.Treeview(self, columns=('word', 'count'), show='headings', height=10)
+        self.top.heading('word', text='Word')
+        self.top.heading('count', text='Count')
+        self.top.column('word', width=160)
+        self.top.column('count', width=80, anchor=tk.E)
+        self.status_var = tk.StringVar()
+        tk.Label(self, textvariable=self.status_var, anchor=tk.W).grid(row=7, column=0, sticky=tk.EW, padx=15, pady=(0, 15))
+        tk.Button(self, text='Refresh', width=10, command=self.refresh).grid(row=7, column=1, sticky=tk.E, padx=15, pady=(0, 15))
+        self.top.grid(row=6, column=0, columnspan=2, sticky=tk.EW, padx=15, pady=15)
+
+        # other variables
+        self.queue = None
+        self.results = queue.Queue()
+        self.cancelled = False
+        self.started = 0
+        self.last_line = 1
+
+        cached = _cache.get(str(self.text))
+        if cached and cached[0] == self.version:
+            self.show_results(cached[1])
+        else:
+            self.refresh()
+
+    def refresh(self):
+        """Start analysing a snapshot of the text widget"""
+        self.stop_worker()
+        self.version = self.master.version
+        self.queue = queue.Queue()
+        self.results = queue.Queue()
+        self.started = time.perf_counter()
+        self.status_var.set('Analysing...')
+        worker = threading.Thread(target=self.analyse, args=(self.queue, self.results), daemon=True)
+        worker.start()
+        self.last_line = int(self.text.index('end-1c').split('.')[0])
+        self.after_idle(self.send_snapshot, 1, self.queue)
+
+    def stop_worker(self):
+        """Abandon the analysis in progress, if any"""
+        if self.queue is not None:
+            self.queue.put(STOP)
+            self.queue = None
+
+    def send_snapshot(self, line, chunks):
+        """Copy the next block of lines to the worker, yielding to the event loop between blocks"""
+        if self.cancelled or chunks is not self.queue:
+            return
+        if self.master.version != self.version:
+            self.refresh()  # the document changed while the snapshot was taken
+            return
+        end = line + SNAPSHOT_LINES
+        chunks.put(''.join(iter_content(self.text, f'{line}.0', f'{end}.0' if end <= self.last_line else 'end-1c')))
+        if end <= self.last_line:
+            self.status_var.set(f'Analysing... {100 * line // self.last_line}%')
+            self.after(1, self.send_snapshot, end, chunks)
+        else:
+            chunks.put(None)
+            self.after(50, self.check_results, chunks)
+
+    @staticmethod
+    def analyse(chunks, results):
+        """Worker thread: tokenize chunks until the end of the snapshot"""
+        analyzer = Analyzer()
+        while True:
+            chunk = chunks.get()
+            if chunk is STOP:
+                return
+            if chunk is None:
+                break
+            analyzer.feed(chunk)
+        results.put(analyzer.results())
+
+    def check_results(self, chunks):
+        """Poll the worker for the finished results"""
+        if self.cancelled or chunks is not self.queue:
+            return
+        try:
+            results = self.results.get_nowait()
+        except queue.Empty:
+            self.after(50, self.check_results, chunks)
+            return
+        self.queue = None
+        _cache[str(self.text)] = (self.version, results)
+        self.show_results(results)
+        self.status_var.set(f'Analysed in {time.perf_counter() - self.started:.2f}s')
+
+    def show_results(self, results):
+        """Fill the labels and the word frequency table"""
+        self.vars['words'].set(f"{results['words']:,d}")
+        self.vars['chars'].set(f"{results['chars']:,d}")
+        self.vars['lines'].set(f"{results['lines']:,d}")
+        self.vars['longest'].set(f"{results['longest'][0]:,d} (line {results['longest'][1]:,d})")
+        self.vars['reading'].set(f"{results['reading']:.0f} min")
+        self.top.delete(*self.top.get_children())
+        for word, count in results['top']:
+            self.top.insert('', tk.END, values=(word, f'{count:,d}'))
+        self.status_var.set('')
+
+    def close(self):
+        """Stop the analysis and close the window"""
+        self.cancelled = True
+        self.stop_worker()
+        self.master.focus_set()
+        self.destroy()
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.version = 0
+        self.text = tk.Text(self)
+        self.text.pack(fill=tk.BOTH, expand=tk.YES)
+        self.text.insert(tk.END, 'This is a test.\nThis is only a test.\n' * 500000)
+
+
+if __name__ == '__main__':
+
+    w = TestWindow()
+    Analytics(w, w.text)
+    w.mainloop()
@@ -0,0 +1,202 @@
+"""
+    Clipboard operations for large payloads: copy and cut stay inside Tcl, and large pastes are
+    inserted in chunks from the event loop so the window keeps responding
+"""
+import time
+import tkinter as tk
+from widgets.fileio import iter_content, SOFT_BREAK
+
+PASTE_CHUNK = 256 << 10  # characters inserted per event loop iteration
+LARGE_PASTE = 1 << 20  # smaller payloads are pasted in one step
+BUSY_TAG = 'ChunkedPaste'  # bindtag that swallows user input while a paste runs
+
+# The clipboard text is kept in a Tcl variable and sliced there, so a paste never converts the payload
+# to a Python string and back.
+TCL_PROCS = r'''
+namespace eval ::chunkedpaste {}
+
+proc ::chunkedpaste::start {w} {
+    set ::chunkedpaste::data($w) [clipboard get -displayof $w]
+    return [string length $::chunkedpaste::data($w)]
+}
+
+proc ::chunkedpaste::step {w first size} {
+    $w insert chunkedpaste [string range $::chunkedpaste::data($w) $first [expr {$first + $size - 1}]]
+}
+
+proc ::chunkedpaste::finish {w} {
+    unset -nocomplain ::chunkedpaste::data($w)
+}
+
+foreach sequence {<Key> <<Paste>> <<PasteSelection>> <<Cut>> <<Clear>> <<Undo>> <<Redo>>} {
+    bind ChunkedPaste $sequence break
+}
+'''
+
+
+def has_soft_breaks(text_widget):
+    """True when the selection contains display-only newlines"""
+    return bool(text_widget.tag_ranges(tk.SEL) and
+                text_widget.tag_nextrange(SOFT_BREAK, tk.SEL_FIRST, tk.SEL_LAST))
+
+
+def copy(text_widget):
+    """Copy the selection to the clipboard; the text only passes through Python when display-only
+    newlines have to be left out
+    """
+    if not has_soft_breaks(text_widget):
+        text_widget.tk.call('tk_textCopy', text_widget)
+        return
+    selected = ''.join(iter_content(text_widget, tk.SEL_FIRST, tk.SEL_LAST))
+    text_widget.clipboard_clear()
+    text_widget.clipboard_append(selected)
+
+
+def cut(text_widget):
+    """Cut the selection to the clipboard; the text only passes through Python when display-only
+    newlines have to be left out
+    """
+    if not has_soft_breaks(text_widget):
+        text_widget.tk.call('tk_textCut', text_widget)
+        return
+    copy(text_widget)
+    text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
+
+
+class ChunkedPaste:
+    """Paste the clipboard at the insert cursor as a single undoable edit
+
+    Payloads larger than LARGE_PASTE are inserted PASTE_CHUNK characters at a time from the event
+    loop. User input to the text widget is swallowed in between so typing cannot interleave with the
+    paste, and `progress` is called with the fraction done after each chunk. With `replace_selection`
+    the selected text is deleted first, as part of the same undo record. Code that edits the text
+    while a paste runs should call `complete` or `cancel` first.
+    """
+
+    def __init__(self, text_widget, progress=None, done=None, replace_selection=False):
+        self.text = text_widget
+        self.progress = progress
+        self.done = done
+        self.position = 0
+        self.size = 0
+        self.pending = None
+        if 'chunkedpaste' in self.text.mark_names():
+            return  # a paste is still in progress
+        self.text.tk.eval(TCL_PROCS)
+        try:
+            self.size = self.text.tk.call('::chunkedpaste::start', self.text)
+        except tk.TclError:
+            self.size = 0  # the clipboard is empty or does not hold text
+        if not self.size:
+            self.finish()
+            return
+
+        self.separators = self.text.cget('autoseparators')
+        self.text.configure(autoseparators=False)
+        self.text.edit_separator()
+        if replace_selection and self.text.tag_ranges(tk.SEL):
+            self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
+        self.text.mark_set('chunkedpaste', tk.INSERT)
+        self.text.mark_gravity('chunkedpaste', tk.RIGHT)
+        if self.size <= LARGE_PASTE:
+            self.insert(self.size)
+            self.finish()
+        else:
+            self.text.bindtags((BUSY_TAG,) + self.text.bindtags())
+            self.pending = self.text.after_idle(self.step)
+
+    @property
+    def running(self):
+        """True while chunks remain to be inserted"""
+        return self.pending is not None
+
+    def insert(self, size):
+        """Insert the next `size` characters of the clipboard"""
+        self.text.tk.call('::chunkedpaste::step', self.text, self.position, size)
+        self.position += size
+
+    def step(self):
+        """Insert one chunk and schedule the next"""
+        self.insert(PASTE_CHUNK)
+        if self.position < self.size:
+            if self.progress:
+                self.progress(self.position / self.size)
+            self.pending = self.text.after(1, self.step)
+        else:
+            self.finish()
+
+    def complete(self):
+        """Insert the rest of the clipboard now"""
+        if self.running:
+            self.insert(self.size - self.position)
+            self.finish()
+
+    def cancel(self):
+        """Stop pasting, keeping the part that was already inserted"""
+        if self.running:
+            self.finish()
+
+    def finish(self):
+        """Close the undo record and release the clipboard copy"""
+        if self.pending is not None:
+            self.text.after_cancel(self.pending)
+            self.pending = None
+            self.text.bindtags(tuple(tag for tag in self.text.bindtags() if tag != BUSY_TAG))
+        self.text.tk.call('::chunkedpaste::finish', self.text)
+        if self.size:
+            self.text.edit_separator()
+            self.text.configure(autoseparators=self.separators)
+            self.text.mark_set(tk.INSERT, 'chunkedpaste')
+            self.text.mark_unset('chunkedpaste')
+            self.text.see(tk.INSERT)
+        if self.done:
+            self.done()
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.text = tk.Text(self, undo=True, autoseparators=True)
+        self.text.pack(fill=tk.BOTH, expand=tk.YES)
+
+
+if __name__ == '__main__':
+
+    w = TestWindow()
+    w.update()
+    line = 'This is a test. This is only a test.\n'
+    for megabytes in (1, 10, 100):
+        payload = line * (megabytes * (1 << 20) // len(line))
+
+        # old paste path: one Python string handed to a single insert call
+        w.text.delete('1.0', tk.END)
+        w.clipboard_clear()
+        w.clipboard_append(payload)
+        start = time.perf_counter()
+        w.text.insert(tk.INSERT, w.clipboard_get())
+        w.update()
+        print(f'{megabytes} MB paste, single insert: {time.perf_counter() - start:.3f}s')
+
+        # chunked paste, timed until the last chunk is in
+        w.text.delete('1.0', tk.END)
+        finished = []
+        start = time.perf_counter()
+        ChunkedPaste(w.text, done=lambda: finished.append(time.perf_counter()))
+        while not finished:
+            w.update()
+        print(f'{megabytes} MB paste, chunked: {finished[0] - start:.3f}s')
+
+        # old and new copy paths on the whole buffer
+        w.text.tag_add(tk.SEL, '1.0', tk.END)
+        start = time.perf_counter()
+        selected = w.text.get(tk.SEL_FIRST, tk.SEL_LAST)
+        w.clipboard_clear()
+        w.clipboard_append(selected)
+        print(f'{megabytes} MB copy through Python: {time.perf_counter() - start:.3f}s')
+        del selected
+        start = time.perf_counter()
+        copy(w.text)
+        print(f'{megabytes} MB copy in Tcl: {time.perf_counter() - start:.3f}s')
+    w.destroy()
@@ -0,0 +1,407 @@
+"""
+    Side-by-side file comparison; the diff runs in a worker process over integer line ids
+"""
+import sys
+import time
+import array
+import bisect
+import pathlib
+import collections
+import multiprocessing
+import tkinter as tk
+from widgets.fileio import read_chunks
+
+MAX_PATIENCE_DEPTH = 8  # nested patience passes before falling back to Myers for a region
+MAX_EDIT_COST = 1000  # Myers steps searched before a region is split at the furthest point reached
+TAGS = {'replace': '#fff3b0', 'delete': '#ffd7d5', 'insert': '#d4f8d4', 'filler': '#eeeeee'}
+
+
+def line_ids(*texts):
+    """Split texts into lines and map every distinct line to a small integer shared by all texts"""
+    ids = {}
+    result = []
+    for text in texts:
+        lines = text.split('\n')
+        result.append((lines, array.array('l', [ids.setdefault(line, len(ids)) for line in lines])))
+    return result
+
+
+def longest_increasing(pairs):
+    """Return the longest subsequence of (i, j) pairs, sorted by i, whose j values increase"""
+    tails = []  # j values of the best subsequence ends, by length
+    tail_index = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        position = bisect.bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+        previous[index] = tail_index[position - 1] if position else -1
+    result = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        result.append(pairs[index])
+        index = previous[index]
+    return result[::-1]
+
+
+def middle_snake(a, b, a0, a1, b0, b1):
+    """Find the middle snake of the shortest edit script between a[a0:a1] and b[b0:b1] (Myers 1986)
+
+    Returns (x, y, u, v): the snake runs from a0 + x, b0 + y to a0 + u, b0 + v. When no snake is found
+    within MAX_EDIT_COST steps, an empty snake at the furthest point reached is returned instead. Only
+    two vectors of size O(N + M) are kept, so memory stays linear in the length of the region.
+    """
+    n, m = a1 - a0, b1 - b0
+    delta = n - m
+    odd = delta % 2 == 1
+    limit = (n + m + 1) // 2 + 1
+    offset = limit + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range(min(limit, MAX_EDIT_COST)):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[offset + delta - k] >= n:
+                return start_x, start_y, x, y
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[a1 - 1 - x] == b[b1 - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return n - x, m - y, n - start_x, m - start_y
+
+    # too expensive: split at the furthest point either search reached, as GNU diff does, so both
+    # halves are still diffed instead of the whole region becoming one replacement
+    best, point = -1, None
+    for k in range(-d, d + 1, 2):
+        x = forward[offset + k]
+        y = x - k
+        if x <= n and 0 <= y <= m and x + y > best:
+            best, point = x + y, (x, y)
+        x = backward[offset + k]
+        y = x - k
+        if x <= n and 0 <= y <= m and x + y > best:
+            best, point = x + y, (n - x, m - y)
+    x, y = point
+    return x, y, x, y
+
+
+def myers(a, b, a0, a1, b0, b1, blocks):
+    """Append the matching blocks (i, j, length) of a[a0:a1] and b[b0:b1] in order
+
+    Each middle snake splits the region in two; the first half is diffed recursively and the second
+    in the loop, so the recursion stays shallow even when many expensive regions are split.
+    """
+    suffixes = []
+    while True:
+        start = a0
+        while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+            a0 += 1
+            b0 += 1
+        if a0 > start:
+            blocks.append((start, b0 - (a0 - start), a0 - start))
+        end = a1
+        while a1 > a0 and b1 > b0 and a[a1 - 1] == b[b1 - 1]:
+            a1 -= 1
+            b1 -= 1
+        if end > a1:
+            suffixes.append((a1, b1, end - a1))
+        if a0 == a1 or b0 == b1:
+            break
+        x, y, u, v = middle_snake(a, b, a0, a1, b0, b1)
+        myers(a, b, a0, a0 + x, b0, b0 + y, blocks)
+        if u > x:
+            blocks.append((a0 + x, b0 + y, u - x))
+        a0, b0 = a0 + u, b0 + v
+    blocks.extend(reversed(suffixes))
+
+
+def patience(a, b, a0, a1, b0, b1, blocks, depth=0):
+    """Append the matching blocks of a[a0:a1] and b[b0:b1], anchoring on lines unique to both sides"""
+    start = a0
+    while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+        a0 += 1
+        b0 += 1
+    if a0 > start:
+        blocks.append((start, b0 - (a0 - start), a0 - start))
+    end = a1
+    while a1 > a0 and b1 > b0 and a[a1 - 1] == b[b1 - 1]:
+        a1 -= 1
+        b1 -= 1
+
+    if a0 < a1 and b0 < b1:
+        count_a = collections.Counter(a[a0:a1])
+        count_b = collections.Counter(b[b0:b1])
+        unique_b = {b[j]: j for j in range(b0, b1) if count_b[b[j]] == 1}
+        pairs = [(i, unique_b[a[i]]) for i in range(a0, a1) if count_a[a[i]] == 1 and a[i] in unique_b]
+        anchors = longest_increasing(pairs)
+        if not anchors or depth >= MAX_PATIENCE_DEPTH:
+            myers(a, b, a0, a1, b0, b1, blocks)
+        else:
+            i, j = a0, b0
+            for anchor_i, anchor_j in anchors:
+                patience(a, b, i, anchor_i, j, anchor_j, blocks, depth + 1)
+                blocks.append((anchor_i, anchor_j, 1))
+                i, j = anchor_i + 1, anchor_j + 1
+            patience(a, b, i, a1, j, b1, blocks, depth + 1)
+
+    if end > a1:
+        blocks.append((a1, b1, end - a1))
+
+
+def opcodes(a, b):
+    """Return difflib style opcodes (tag, i1, i2, j1, j2) that turn sequence a into b
+
+    Lines unique to both sides anchor the diff, so typical files with scattered edits diff in a few
+    seconds even at a million lines. Files made of a few distinct lines (repeated log entries, blank
+    lines) leave no anchors and are diffed by Myers as a whole, whose cost grows with the number of
+    differences: 1M lines drawn from 50 distinct lines with 2% of them edited take about 40s.
+    """
+    blocks = []
+    patience(a, b, 0, len(a), 0, len(b), blocks)
+    blocks.append((len(a), len(b), 0))
+    codes = []
+    i = j = 0
+    for block_i, block_j, size in blocks:
+        if i < block_i and j < block_j:
+            codes.append(('replace', i, block_i, j, block_j))
+        elif i < block_i:
+            codes.append(('delete', i, block_i, j, j))
+        elif j < block_j:
+            codes.append(('insert', i, i, j, block_j))
+        if size:
+            if codes and codes[-1][0] == 'equal':
+                codes[-1] = ('equal', codes[-1][1], block_i + size, codes[-1][3], block_j + size)
+            else:
+                codes.append(('equal', block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return codes
+
+
+def compare(left_text, right_file):
+    """Worker process: diff text against a file and lay both out side by side
+
+    Returns the aligned left and right texts (missing lines are padded with empty filler lines so
+    both sides have the same line count), the hunks as (first line, end line, tag, left lines, right
+    lines) in display lines, and the time taken.
+    """
+    started = time.perf_counter()
+    (left, a), (right, b) = line_ids(left_text, ''.join(read_chunks(right_file)))
+    del left_text
+    left_out, right_out, hunks = [], [], []
+    line = 1
+    for tag, i1, i2, j1, j2 in opcodes(a, b):
+        left_out.extend(left[i1:i2])
+        right_out.extend(right[j1:j2])
+        height = max(i2 - i1, j2 - j1)
+        left_out.extend([''] * (height - (i2 - i1)))
+        right_out.extend([''] * (height - (j2 - j1)))
+        if tag != 'equal':
+            hunks.append((line, line + height, tag, i2 - i1, j2 - j1))
+        line += height
+    return '\n'.join(left_out), '\n'.join(right_out), hunks, time.perf_counter() - started
+
+
+class CompareView(tk.Toplevel):
+    """Show two documents side by side with the differences highlighted
+
+    Both sides have the same number of display lines, so scrolling one scrolls the other to the same
+    place. Hunks are only tagged once they scroll into view.
+    """
+
+    def __init__(self, master, left_text, left_name, right_file):
+        super().__init__(master)
+        self.right_file = pathlib.Path(right_file)
+        self.title(f'{left_name} - {self.right_file.name}')
+        self.transient(master)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.geometry('1200x700')
+
+        # create widgets
+        self.frame = tk.Frame(self)
+        self.vbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.left = tk.Text(self.frame, wrap=tk.NONE, font=getattr(master, 'font', None),
+                            yscrollcommand=self.on_scroll)
+        self.right = tk.Text(self.frame, wrap=tk.NONE, font=getattr(master, 'font', None),
+                             yscrollcommand=self.on_scroll)
+        for text in (self.left, self.right):
+            for tag, color in TAGS.items():
+                text.tag_configure(tag, background=color)
+        left_label = tk.Label(self.frame, text=left_name, anchor=tk.W)
+        right_label = tk.Label(self.frame, text=str(self.right_file), anchor=tk.W)
+        self.toolbar = tk.Frame(self)
+        self.prev_btn = tk.Button(self.toolbar, text='Previous', width=10, command=self.previous_hunk)
+        self.next_btn = tk.Button(self.toolbar, text='Next', width=10, command=self.next_hunk)
+        self.status_var = tk.StringVar()
+        self.status_var.set('Comparing...')
+        status = tk.Label(self.toolbar, textvariable=self.status_var, anchor=tk.W)
+
+        # arrange widgets on grid
+        left_label.grid(row=0, column=0, sticky=tk.EW)
+        right_label.grid(row=0, column=1, sticky=tk.EW)
+        self.left.grid(row=1, column=0, sticky=tk.NSEW)
+        self.right.grid(row=1, column=1, sticky=tk.NSEW)
+        self.vbar.grid(row=1, column=2, sticky=tk.NS)
+        self.frame.grid_rowconfigure(1, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1, uniform='side')
+        self.frame.grid_columnconfigure(1, weight=1, uniform='side')
+        self.prev_btn.pack(side=tk.LEFT, padx=(5, 2), pady=5)
+        self.next_btn.pack(side=tk.LEFT, padx=2, pady=5)
+        status.pack(side=tk.LEFT, fill=tk.X, padx=5)
+        self.toolbar.pack(side=tk.TOP, fill=tk.X)
+        self.frame.pack(fill=tk.BOTH, expand=tk.YES)
+
+        # other variables
+        self.hunks = []
+        self.starts = []
+        self.tagged = set()
+        self.current = -1
+        self.pending = None
+        self.polling = None
+
+        # event binding
+        self.bind("<F7>", lambda event: self.next_hunk())
+        self.bind("<Shift-F7>", lambda event: self.previous_hunk())
+        self.left.bind("<Configure>", self.schedule_tagging)
+
+        # the diff runs in another process so that it does not compete with the GUI for the GIL
+        self.started = time.perf_counter()
+        self.pool = multiprocessing.Pool(1)
+        self.result = self.pool.apply_async(compare, (left_text, self.right_file))
+        self.polling = self.after(50, self.check_result)
+
+    def check_result(self):
+        """Poll the worker process for the diff"""
+        if not self.result.ready():
+            self.polling = self.after(50, self.check_result)
+            return
+        self.polling = None
+        self.pool.close()
+        try:
+            left, right, self.hunks, seconds = self.result.get()
+        except Exception as error:
+            self.status_var.set(f'Could not compare: {error}')
+            return
+        self.starts = [hunk[0] for hunk in self.hunks]
+        for text, content in ((self.left, left), (self.right, right)):
+            text.insert('1.0', content)
+            text.configure(state=tk.DISABLED)
+        self.status_var.set(f'{len(self.hunks):,d} differences; diffed in {seconds:.2f}s, '
+                            f'shown in {time.perf_counter() - self.started:.2f}s')
+        self.schedule_tagging()
+
+    def yview(self, *args):
+        """Scroll both sides from the scrollbar"""
+        self.left.yview(*args)
+        self.right.yview(*args)
+
+    def on_scroll(self, first, last):
+        """Keep the other side and the scrollbar in step with the side that scrolled"""
+        self.vbar.set(first, last)
+        for text in (self.left, self.right):
+            if text.yview()[0] != float(first):
+                text.yview_moveto(first)
+        self.schedule_tagging()
+
+    def schedule_tagging(self, event=None):
+        """Tag the visible hunks once the event loop is idle"""
+        if self.pending is None:
+            self.pending = self.after_idle(self.tag_visible)
+
+    def tag_visible(self):
+        """Tag the hunks that intersect the visible lines and have not been tagged yet"""
+        self.pending = None
+        if not self.hunks:
+            return
+        top = int(self.left.index('@0,0').split('.')[0])
+        bottom = int(self.left.index(f'@0,{self.left.winfo_height()}').split('.')[0])
+        index = max(0, bisect.bisect_right(self.starts, top) - 1)
+        while index < len(self.hunks) and self.hunks[index][0] <= bottom:
+            if index not in self.tagged:
+                self.tag_hunk(self.hunks[index])
+                self.tagged.add(index)
+            index += 1
+
+    def tag_hunk(self, hunk):
+        """Highlight one hunk on both sides; padding lines are shown as filler"""
+        first, last, tag, left_lines, right_lines = hunk
+        for text, lines in ((self.left, left_lines), (self.right, right_lines)):
+            if lines:
+                text.tag_add(tag, f'{first}.0', f'{first + lines}.0')
+            if first + lines < last:
+                text.tag_add('filler', f'{first + lines}.0', f'{last}.0')
+
+    def show_hunk(self, index):
+        """Scroll both sides to a hunk"""
+        if not self.hunks:
+            return
+        self.current = index % len(self.hunks)
+        line = self.hunks[self.current][0]
+        self.left.see(f'{line}.0')
+        self.right.yview_moveto(self.left.yview()[0])
+        self.status_var.set(f'Difference {self.current + 1:,d} of {len(self.hunks):,d}')
+
+    def next_hunk(self):
+        """Go to the next difference"""
+        self.show_hunk(self.current + 1)
+
+    def previous_hunk(self):
+        """Go to the previous difference"""
+        self.show_hunk(self.current - 1)
+
+    def close(self):
+        """Stop the comparison and close the window"""
+        for callback in (self.polling, self.pending):
+            if callback is not None:
+                self.after_cancel(callback)
+        self.pool.terminate()  # stops a diff that is still running
+        self.master.focus_set()
+        self.destroy()
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.text = tk.Text(self)
+        self.text.pack(fill=tk.BOTH, expand=tk.YES)
+
+
+if __name__ == '__main__':
+
+    # time the diff of two 1M line documents with scattered edits
+    lines = [f'line {i}: the quick brown fox jumps over the lazy dog' for i in range(1000000)]
+    changed = list(lines)
+    for i in range(0, len(changed), 1000):
+        changed[i] = changed[i].upper()
+    left_text, right_text = '\n'.join(lines), '\n'.join(changed)
+    start = time.perf_counter()
+    (_, a), (_, b) = line_ids(left_text, right_text)
+    codes = opcodes(a, b)
+    print(f'{sum(1 for code in codes if code[0] != "equal"):,d} hunks in {time.perf_counter() - start:.2f}s')
+
+    if len(sys.argv) > 1:
+        w = TestWindow()
+        CompareView(w, left_text, 'generated', sys.argv[1])
+        w.mainloop()
@@ -0,0 +1,207 @@
+"""
+    Chunked file loading for the text widget, with a long line mode for minified files and streaming
+    support for gzip, bzip2 and xz compressed files
+"""
+import os
+import bz2
+import gzip
+import lzma
+import time
+import pathlib
+import tempfile
+import tkinter as tk
+
+CHUNK_SIZE = 1 << 20  # characters inserted into the text widget per call
+SAMPLE_SIZE = 1 << 20  # bytes inspected when checking for long lines
+LONG_LINE = 5000  # lines longer than this make the Tk text layout slow
+SPLIT_WIDTH = 1000  # width of the display lines in long line mode
+SOFT_BREAK = 'softbreak'  # tag of the newlines added for display only
+
+# compression formats recognised by their leading bytes, and by file suffix when saving a new file
+MAGIC = {b'\x1f\x8b': 'gzip', b'BZh': 'bz2', b'\xfd7zXZ\x00': 'xz'}
+SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+def detect_compression(file):
+    """Return the compression format of a file from its magic bytes, or None for plain files"""
+    with open(file, 'rb') as f:
+        head = f.read(6)
+    for magic, compression in MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_file(file, mode='r', compression=None, level=None):
+    """Open a plain or compressed file; compressed files are (de)compressed as they are streamed"""
+    if compression is None:
+        return open(file, mode)
+    if 'b' not in mode:
+        mode += 't'
+    if 'w' in mode and level is not None:
+        option = {'xz': 'preset'}.get(compression, 'compresslevel')
+        return OPENERS[compression](file, mode, **{option: level})
+    return OPENERS[compression](file, mode)
+
+
+def iter_chunks(f, size=CHUNK_SIZE):
+    """Yield the text of an open file in chunks of at most `size` characters"""
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def read_chunks(file, size=CHUNK_SIZE):
+    """Yield the text of a file in chunks of at most `size` characters"""
+    with open_file(file, compression=detect_compression(file)) as f:
+        yield from iter_chunks(f, size)
+
+
+def longest_line(file, limit=SAMPLE_SIZE):
+    """Return the length of the longest line in the first `limit` bytes of a file"""
+    with open_file(file, 'rb', detect_compression(file)) as f:
+        sample = f.read(limit)
+    return max(map(len, sample.split(b'\n')), default=0)
+
+
+def soft_split(chunks, width=SPLIT_WIDTH):
+    """Yield (text, tags) pieces with a tagged newline inserted every `width` characters of a line"""
+    column = 0
+    for chunk in chunks:
+        pos = 0
+        while pos < len(chunk):
+            newline = chunk.find('\n', pos)
+            stop = len(chunk) if newline == -1 else newline
+            while stop - pos > width - column:
+                cut = pos + width - column
+                yield chunk[pos:cut], ()
+                yield '\n', (SOFT_BREAK,)
+                pos, column = cut, 0
+            if stop > pos:
+                yield chunk[pos:stop], ()
+                column += stop - pos
+            pos = stop
+            if newline != -1:
+                yield '\n', ()
+                pos, column = newline + 1, 0
+
+
+def insert_chunks(text_widget, chunks, split_width=None, index=tk.END):
+    """Insert chunks into a text widget, at the end by default, optionally splitting long lines"""
+    if index != tk.END:
+        # a mark with right gravity moves past each chunk as it is inserted
+        text_widget.mark_set('insertchunks', index)
+        text_widget.mark_gravity('insertchunks', tk.RIGHT)
+        index = 'insertchunks'
+    if not split_width:
+        for chunk in chunks:
+            text_widget.insert(index, chunk)
+    else:
+        args = []
+        size = 0
+        for piece, tags in soft_split(chunks, split_width):
+            args.extend((piece, tags))
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                text_widget.insert(index, *args)
+                args, size = [], 0
+        if args:
+            text_widget.insert(index, *args)
+    if index != tk.END:
+        text_widget.mark_unset(index)
+
+
+def write_compressed(file, text, compression, level=None):
+    """Compress text into a file and return (uncompressed bytes, compressed bytes, seconds)
+
+    The data is written to a temporary file that replaces the target when complete, so an interrupted
+    save never leaves a truncated file behind. Safe to call from a worker thread.
+    """
+    started = time.perf_counter()
+    file = pathlib.Path(file)
+    temp = file.with_name(file.name + '.tmp')
+    try:
+        with open_file(temp, 'w', compression, level) as f:
+            for pos in range(0, len(text), CHUNK_SIZE):
+                f.write(text[pos:pos + CHUNK_SIZE])
+            f.flush()
+            raw = f.buffer.tell()
+        os.replace(temp, file)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return raw, file.stat().st_size, time.perf_counter() - started
+
+
+def iter_content(text_widget, start='1.0', end=tk.END):
+    """Yield the text widget content between two indices without the display-only newlines"""
+    ranges = text_widget.tag_ranges(SOFT_BREAK)
+    for index in range(0, len(ranges), 2):
+        first, last = ranges[index], ranges[index + 1]
+        if text_widget.compare(last, '<=', start):
+            continue
+        if text_widget.compare(first, '>=', end):
+            break
+        if text_widget.compare(first, '>', start):
+            yield text_widget.get(start, first)
+        start = last
+    yield text_widget.get(start, end)
+
+
+def content_index(text_widget, offset):
+    """Return the text index of a character offset into the content, skipping display-only newlines"""
+    index = '1.0'
+    ranges = text_widget.tag_ranges(SOFT_BREAK)
+    for first, last in zip(ranges[0::2], ranges[1::2]):
+        length = (text_widget.count(index, first, 'chars') or (0,))[0]
+        if length > offset:
+            break
+        offset -= length
+        index = last
+    return text_widget.index(f'{index} + {offset} chars')
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.text = tk.Text(self, wrap=tk.WORD, undo=True)
+        self.text.pack(fill=tk.BOTH, expand=tk.YES)
+
+
+if __name__ == '__main__':
+
+    # benchmark a 20 MB single line file with and without long line mode
+    file = pathlib.Path(tempfile.gettempdir()) / 'long_line.json'
+    file.write_text('[' + ','.join(['{"key": "value", "number": 12345}'] * 600000) + ']')
+    print(f'longest line in sample: {longest_line(file):,d}')
+
+    w = TestWindow()
+    for label, wrap, width in (('wrap=word', tk.WORD, None), ('long line mode', tk.NONE, SPLIT_WIDTH)):
+        w.text.delete('1.0', tk.END)
+        w.text.configure(wrap=wrap)
+        start = time.perf_counter()
+        insert_chunks(w.text, read_chunks(file), width)
+        w.update()
+        print(f'{label} load: {time.perf_counter() - start:.3f}s')
+
+        start = time.perf_counter()
+        for _ in range(20):
+            w.text.yview_scroll(1, 'pages')
+            w.update()
+        print(f'{label} scroll: {time.perf_counter() - start:.3f}s')
+
+        start = time.perf_counter()
+        w.text.mark_set(tk.INSERT, '1.500')
+        for char in 'typing test':
+            w.text.insert(tk.INSERT, char)
+            w.update()
+        print(f'{label} typing: {time.perf_counter() - start:.3f}s')
+
+        content = ''.join(iter_content(w.text, '1.0', 'end-1c'))
+        print(f'{label} content preserved: {len(content) == len(file.read_text()) + len("typing test")}')
+    file.unlink()
@@ -4,12 +4,32 @@
     Author: Israel Dryer
     Modified: 2020-06-07
 """
+import time
 import tkinter as tk
 from tkinter.ttk import Combobox
 from tkinter import font
 
+# sorted font families, built once per application
+_families = None
+
+
+def font_families(root=None):
+    """Return the cached, sorted list of installed font families"""
+    global _families
+    if _families is None:
+        _families = sorted(set(font.families(root)), key=str.lower)
+    return _families
+
+
+def preload_families(root):
+    """Build the font family cache once the application is idle"""
+    root.after_idle(font_families, root)
+
+
 class FontSelector(tk.Toplevel):
     """A font selector popup"""
+    SAMPLE = 'AaBbYyZz 0123456789'
+
     def __init__(self, master):
         super().__init__(master)
         self.master = master
@@ -21,48 +41,135 @@ class FontSelector(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", self.cancel)
         self.focus_set()
 
-        # get sorted list of fonts families
-        fonts = sorted(font.families())
+        # cached list of font families and the current type-ahead filter
+        self.families = font_families(self)
+        self.matches = self.families
+        self.query = ''
         sizes = [8, 9, 10, 11, 12, 14, 16, 18, 20, 22, 24, 26, 28, 36, 38, 72]
-        
+
         # create widgets
-        self.family = Combobox(self, values=fonts, width=30)
-        self.family.set(self.master.font['family'])
+        self.family = tk.StringVar()
+        self.family.set(self.font['family'])
+        self.family_entry = tk.Entry(self, textvariable=self.family, width=30)
+        self.family_frame = tk.Frame(self)
+        self.family_list = tk.Listbox(self.family_frame, height=8, exportselection=False)
+        self.family_scroll = tk.Scrollbar(self.family_frame, orient=tk.VERTICAL, command=self.family_list.yview)
+        self.family_list.configure(yscrollcommand=self.family_scroll.set)
+        self.family_list.insert(tk.END, *self.families)
         self.size = Combobox(self, values=sizes, width=2)
-        self.size.set(self.master.font['size'])
+        self.size.set(self.font['size'])
         self.weight = tk.StringVar()
         self.weight.set(self.font['weight'])
-        self.weight_cb = tk.Checkbutton(self, text='Bold', anchor=tk.W, variable=self.weight, onvalue='bold', offvalue='normal')
+        self.weight_cb = tk.Checkbutton(self, text='Bold', anchor=tk.W, variable=self.weight, onvalue='bold',
+                                        offvalue='normal', command=self.update_preview)
         self.slant = tk.StringVar()
         self.slant.set(self.font['slant'])
-        self.slant_cb = tk.Checkbutton(self, text='Slant', anchor=tk.W, variable=self.slant, onvalue='italic', offvalue='roman')
+        self.slant_cb = tk.Checkbutton(self, text='Slant', anchor=tk.W, variable=self.slant, onvalue='italic',
+                                       offvalue='roman', command=self.update_preview)
         self.underline = tk.IntVar()
         self.underline.set(self.font['underline'])
-        self.underline_cb = tk.Checkbutton(self, text='Underline', anchor=tk.W, variable=self.underline)
+        self.underline_cb = tk.Checkbutton(self, text='Underline', anchor=tk.W, variable=self.underline,
+                                           command=self.update_preview)
         self.overstrike = tk.IntVar()
         self.overstrike.set(self.font['overstrike'])
-        self.overstrike_cb = tk.Checkbutton(self, text='Overstrike', anchor=tk.W, variable=self.overstrike)
+        self.overstrike_cb = tk.Checkbutton(self, text='Overstrike', anchor=tk.W, variable=self.overstrike,
+                                            command=self.update_preview)
         self.ok_btn = tk.Button(self, text='OK', command=self.change_font)
         self.cancel_btn = tk.Button(self, text='Cancel', command=self.cancel)
 
+        # preview pane renders a sample with a private font instead of the document
+        self.preview_font = font.Font(self, **self.font.configure())
+        self.preview = tk.Label(self, text=self.SAMPLE, font=self.preview_font, relief=tk.SUNKEN, bd=1,
+                                width=30, height=2)
+
         # arrange widgets on grid
-        self.family.grid(row=0, column=0, columnspan=4, sticky=tk.EW, padx=15, pady=15, ipadx=2, ipady=2)
-        self.size.grid(row=0, column=4, sticky=tk.EW, padx=15, pady=15, ipadx=2, ipady=2)
-        self.weight_cb.grid(row=1, column=0, sticky=tk.EW, padx=15)
-        self.slant_cb.grid(row=1, column=1, sticky=tk.EW, padx=15)
-        self.underline_cb.grid(row=2, column=0, sticky=tk.EW, padx=15)
-        self.overstrike_cb.grid(row=2, column=1, sticky=tk.EW, padx=15)
-        self.ok_btn.grid(row=1, column=3, columnspan=2, sticky=tk.EW, ipadx=15, padx=15)
-        self.cancel_btn.grid(row=2, column=3, columnspan=2, sticky=tk.EW, ipadx=15, padx=15, pady=(5, 15))
+        self.family_entry.grid(row=0, column=0, columnspan=4, sticky=tk.EW, padx=15, pady=(15, 0), ipadx=2, ipady=2)
+        self.family_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+        self.family_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.family_frame.grid(row=1, column=0, columnspan=4, sticky=tk.EW, padx=15, pady=(0, 15))
+        self.size.grid(row=0, column=4, sticky=tk.EW, padx=15, pady=(15, 0), ipadx=2, ipady=2)
+        self.weight_cb.grid(row=2, column=0, sticky=tk.EW, padx=15)
+        self.slant_cb.grid(row=2, column=1, sticky=tk.EW, padx=15)
+        self.underline_cb.grid(row=3, column=0, sticky=tk.EW, padx=15)
+        self.overstrike_cb.grid(row=3, column=1, sticky=tk.EW, padx=15)
+        self.ok_btn.grid(row=2, column=3, columnspan=2, sticky=tk.EW, ipadx=15, padx=15)
+        self.cancel_btn.grid(row=3, column=3, columnspan=2, sticky=tk.EW, ipadx=15, padx=15, pady=(5, 15))
+        self.preview.grid(row=4, column=0, columnspan=5, sticky=tk.EW, padx=15, pady=(0, 15))
+
+        # event binding
+        self.family_entry.bind("<KeyRelease>", self.filter_families)
+        self.family_list.bind("<<ListboxSelect>>", self.select_family)
+        self.size.bind("<<ComboboxSelected>>", self.update_preview)
+        self.size.bind("<KeyRelease>", self.update_preview)
+        self.bind("<Return>", lambda event: self.change_font())
+        self.bind("<Escape>", lambda event: self.cancel())
+        self.family_entry.focus_set()
+        self.show_family(self.family.get())
+
+    def filter_families(self, event=None):
+        """Narrow the family list to names containing the typed text"""
+        query = self.family.get().strip().lower()
+        if query == self.query:
+            return
+        # an extended query can only match a subset of the previous matches
+        source = self.matches if query.startswith(self.query) else self.families
+        self.matches = [name for name in source if query in name.lower()]
+        self.query = query
+        self.family_list.delete(0, tk.END)
+        self.family_list.insert(tk.END, *self.matches)
+        if self.matches:
+            self.family_list.selection_set(0)
+            self.family_list.see(0)
+        self.update_preview()
+
+    def select_family(self, event=None):
+        """Copy the selected family name into the entry"""
+        selection = self.family_list.curselection()
+        if selection:
+            self.family.set(self.family_list.get(selection[0]))
+            self.update_preview()
+
+    def show_family(self, family):
+        """Select and scroll to the given family in the list"""
+        try:
+            index = self.matches.index(family)
+        except ValueError:
+            return
+        self.family_list.selection_clear(0, tk.END)
+        self.family_list.selection_set(index)
+        self.family_list.see(index)
+
+    def get_options(self):
+        """Return the font options currently chosen in the dialog"""
+        selection = self.family_list.curselection()
+        family = self.family.get().strip()
+        if selection and family not in self.families:
+            family = self.family_list.get(selection[0])  # complete a partially typed name
+        try:
+            size = int(self.size.get())
+        except ValueError:
+            size = self.font['size']
+        return {
+            'family': family or self.font['family'],
+            'size': size,
+            'weight': self.weight.get(),
+            'slant': self.slant.get(),
+            'underline': self.underline.get(),
+            'overstrike': self.overstrike.get()}
+
+    def update_preview(self, event=None):
+        """Render the sample text with the chosen options"""
+        self.preview_font.configure(**self.get_options())
 
     def change_font(self):
         """Apply font changes to the main text widget"""
-        self.font['family'] = self.family.get()
-        self.font['size'] = self.size.get()
-        self.font['weight'] = self.weight.get()
-        self.font['underline'] = self.underline.get()
-        self.font['slant'] = self.slant.get()
-        self.font['overstrike'] = self.overstrike.get()
+        options = self.get_options()
+        current = self.font.configure()
+        changed = {key: value for key, value in options.items() if current.get(key) != value}
+        if changed:
+            # a single configure call triggers a single relayout of the document
+            self.font.configure(**changed)
+            self.master.event_generate('<<FontChanged>>')
         self.master.text.focus()
         self.destroy()
 
@@ -80,10 +187,26 @@ class TestWindow(tk.Tk):
         self.font = font.Font(family='Courier New', size=14, weight=font.BOLD, slant=font.ROMAN, underline=False, overstrike=False)
         self.text = tk.Text(self, font=self.font)
         self.text.pack(fill=tk.BOTH, expand=tk.YES)
-        self.text.insert(tk.END, 'This is a test. This is only a test.')
+        self.text.insert(tk.END, 'This is a test. This is only a test.\n' * 200000)
 
 if __name__ == '__main__':
 
     w = TestWindow()
-    FontSelector(w)
-    w.mainloop()
\ No newline at end of file
+    w.update()
+
+    # time the first open (builds the family cache) and a cached open
+    for label in ('first open', 'cached open'):
+        start = time.perf_counter()
+        selector = FontSelector(w)
+        w.update()
+        print(f'{label}: {time.perf_counter() - start:.3f}s')
+        selector.cancel()
+
+    # time applying a new size to the large document
+    selector = FontSelector(w)
+    selector.size.set(18)
+    start = time.perf_counter()
+    selector.change_font()
+    w.update()
+    print(f'apply: {time.perf_counter() - start:.3f}s')
+    w.mainloop()
@@ -0,0 +1,119 @@
+"""
+    Line number gutter for a text widget that only draws the lines in view
+"""
+import time
+import tkinter as tk
+from tkinter import font as tkfont
+
+
+class LineNumbers(tk.Canvas):
+    """Gutter showing the line numbers of the visible part of a text widget
+
+    Redraws are coalesced into one idle callback per burst of scroll, resize and modify events, and
+    each redraw only visits the lines on screen, so the cost does not depend on the document length.
+    """
+    PAD = 6
+
+    def __init__(self, master, text_widget):
+        super().__init__(master, width=30, highlightthickness=0, bd=0, bg='#f0f0f0')
+        self.text = text_widget
+        self.pending = None
+        self.digits = 0
+
+        # follow the vertical scroll position; the existing scroll command is still called
+        self.scroll_command = self.tk.splitlist(self.text.cget('yscrollcommand'))
+        self.text.configure(yscrollcommand=self.on_scroll)
+
+        # event binding
+        self.text.bind("<Configure>", self.schedule_redraw, add='+')
+        self.text.bind("<<Modified>>", self.schedule_redraw, add='+')
+        self.text.bind("<KeyRelease>", self.schedule_redraw, add='+')
+
+    def on_scroll(self, first, last):
+        """Pass the scroll position on to the scrollbar and schedule a redraw"""
+        if self.scroll_command:
+            self.tk.call(*self.scroll_command, first, last)
+        self.schedule_redraw()
+
+    def schedule_redraw(self, event=None):
+        """Redraw once the event loop is idle"""
+        if self.pending is None:
+            self.pending = self.after_idle(self.redraw)
+
+    def show(self):
+        """Pack the gutter to the left of the text widget"""
+        self.pack(side=tk.LEFT, fill=tk.Y, before=self.text)
+        self.schedule_redraw()
+
+    def hide(self):
+        """Remove the gutter from the screen"""
+        self.pack_forget()
+
+    def redraw(self):
+        """Draw the numbers of the logical lines that start on screen"""
+        self.pending = None
+        if not self.winfo_ismapped():
+            return
+        self.delete('all')
+        text_font = self.text.cget('font')
+        last = int(self.text.index('end-1c').split('.')[0])
+
+        # size the gutter to the widest line number in the document
+        if len(str(last)) != self.digits:
+            self.digits = len(str(last))
+            width = tkfont.Font(self, font=text_font).measure('0' * self.digits)
+            self.configure(width=width + 2 * self.PAD)
+        x = int(self.cget('width')) - self.PAD
+
+        # a wrapped line that starts above the view is numbered where it starts, not here; @0,0 alone
+        # is not enough as it points into the line when the view is scrolled horizontally
+        index = self.text.index('@0,0 linestart')
+        if self.text.compare('@0,0 display linestart', '!=', index):
+            index = self.text.index(index + ' +1line')
+        while True:
+            info = self.text.dlineinfo(index)
+            if info is None:
+                break
+            line = int(index.split('.')[0])
+            self.create_text(x, info[1], anchor=tk.NE, text=line, font=text_font, fill='#808080')
+            if line >= last:
+                break
+            index = f'{line + 1}.0'
+
+    def refresh(self, event=None):
+        """Recompute the gutter width and redraw, e.g. after the font changed"""
+        self.digits = 0
+        self.schedule_redraw()
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.frame = tk.Frame(self)
+        self.text = tk.Text(self.frame, wrap=tk.WORD)
+        self.vbar = tk.Scrollbar(self.frame, command=self.text.yview)
+        self.text.configure(yscrollcommand=self.vbar.set)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+        self.frame.pack(fill=tk.BOTH, expand=tk.YES)
+        self.text.insert(tk.END, 'This is a test. This is only a test.\n' * 1000000)
+        self.numbers = LineNumbers(self.frame, self.text)
+        self.numbers.show()
+
+
+if __name__ == '__main__':
+
+    w = TestWindow()
+    w.update()
+
+    # time the redraw while scrolling through a 1M line document
+    start = time.perf_counter()
+    pages = 200
+    for _ in range(pages):
+        w.text.yview_scroll(1, 'pages')
+        w.update_idletasks()
+        w.numbers.redraw()
+    print(f'average redraw while scrolling: {(time.perf_counter() - start) / pages * 1000:.2f}ms')
+    w.mainloop()
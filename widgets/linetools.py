@@ -0,0 +1,115 @@
+"""
+    Sort, remove duplicate and filter lines of text; sorting spills to temporary files for huge input
+"""
+import re
+import heapq
+import tempfile
+
+MEMORY_BUDGET = 64 << 20  # characters sorted in memory before runs are spilled to disk
+NUMBER_RE = re.compile(r'\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+DIGITS_RE = re.compile(r'([0-9]+)')
+
+
+def lexical_key(line):
+    """Sort by the plain text of the line"""
+    return line
+
+
+def numeric_key(line):
+    """Sort by the number at the start of the line; lines without a number come last"""
+    match = NUMBER_RE.match(line)
+    return (0, float(match.group(1))) if match else (1, 0.0)
+
+
+def natural_key(line):
+    """Sort embedded numbers by value so that 'file10' comes after 'file9'"""
+    parts = DIGITS_RE.split(line.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+SORT_KEYS = {'lexical': lexical_key, 'numeric': numeric_key, 'natural': natural_key}
+
+
+def sort_lines(lines, key=lexical_key, budget=MEMORY_BUDGET):
+    """Return an iterator of the lines in stable sorted order
+
+    Lines are collected into runs of about `budget` characters. If the input fits in one run it is
+    sorted in memory; otherwise each sorted run is written to a temporary file and the runs are
+    merged, which keeps memory bounded by the budget rather than the input size.
+    """
+    runs = []
+    run = []
+    size = 0
+    for line in lines:
+        run.append(line)
+        size += len(line) + 1
+        if size >= budget:
+            runs.append(spill(sorted(run, key=key)))
+            run, size = [], 0
+    run.sort(key=key)
+    if not runs:
+        return iter(run)
+    if run:
+        runs.append(spill(run))
+    # heapq.merge prefers earlier runs for equal keys, which keeps the sort stable
+    return heapq.merge(*(read_run(file) for file in runs), key=key)
+
+
+def temporary_file():
+    """Return a temporary text file that only treats '\\n' as a line break"""
+    return tempfile.TemporaryFile('w+', encoding='utf-8', errors='surrogatepass', newline='\n')
+
+
+def spill(run):
+    """Write a sorted run to a temporary file and return the open file positioned at the start"""
+    file = temporary_file()
+    file.writelines(line + '\n' for line in run)
+    file.seek(0)
+    return file
+
+
+def read_run(file):
+    """Yield the lines of a spilled run, closing (and deleting) the file when done"""
+    with file:
+        for line in file:
+            yield line[:-1]
+
+
+def unique_lines(lines):
+    """Yield each distinct line once, in order of first appearance"""
+    seen = set()
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            yield line
+
+
+def filter_lines(lines, pattern, keep=True):
+    """Yield the lines that match (or, with keep=False, do not match) a regular expression"""
+    search = re.compile(pattern).search
+    return (line for line in lines if bool(search(line)) == keep)
+
+
+def process_file(source, target, func, *args, **kwargs):
+    """Stream the lines of a text file through a line function into another file
+
+    Neither the input nor the output is held in memory as a whole; a trailing newline stays at the
+    end of the output. The target is returned positioned at the start.
+    """
+    trailing = ''
+
+    def read_lines():
+        nonlocal trailing
+        for line in source:
+            trailing = '\n' if line.endswith('\n') else ''
+            yield line[:-1] if trailing else line
+
+    separator = ''
+    for line in func(read_lines(), *args, **kwargs):
+        target.write(separator)
+        target.write(line)
+        separator = '\n'
+    target.write(trailing)
+    target.seek(0)
+    return target
@@ -0,0 +1,89 @@
+"""
+    Session store that remembers the editor state between runs
+"""
+import os
+import sys
+import json
+import pathlib
+import threading
+
+
+def config_dir():
+    """Return the per-user configuration directory for the application"""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or pathlib.Path.home() / 'AppData' / 'Roaming'
+    elif sys.platform == 'darwin':
+        base = pathlib.Path.home() / 'Library' / 'Application Support'
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or pathlib.Path.home() / '.config'
+    return pathlib.Path(base) / 'Notepad-Tk'
+
+
+class Session:
+    """Load the saved session and write changes back in the background
+
+    The state is a small JSON document. Saves are debounced on the Tk event loop so that a burst of
+    key strokes results in a single write, and the file itself is written by a worker thread.
+    """
+    DELAY = 1500  # milliseconds of inactivity before the state is written
+    MAX_RECENT = 10
+
+    def __init__(self, master, path=None):
+        self.master = master
+        self.path = pathlib.Path(path) if path else config_dir() / 'session.json'
+        self.lock = threading.Lock()
+        self.pending = None
+        self.state = self.load()
+
+    def get(self, key, default=None):
+        """Return a value from the saved session"""
+        return self.state.get(key, default)
+
+    def load(self):
+        """Read the saved session; a missing or damaged file gives an empty session"""
+        try:
+            state = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def schedule_save(self, event=None):
+        """Save the session once the editor has been idle for a moment"""
+        if self.pending:
+            self.master.after_cancel(self.pending)
+        self.pending = self.master.after(self.DELAY, self.save)
+
+    def save(self):
+        """Collect the current state on the main thread and write it in the background"""
+        self.pending = None
+        self.state = self.master.get_session_state()
+        data = json.dumps(self.state, separators=(',', ':'))
+        threading.Thread(target=self.write, args=(data,), daemon=True).start()
+
+    def save_now(self):
+        """Write the current state immediately; used when the application closes"""
+        if self.pending:
+            self.master.after_cancel(self.pending)
+            self.pending = None
+        self.state = self.master.get_session_state()
+        self.write(json.dumps(self.state, separators=(',', ':')))
+
+    def write(self, data):
+        """Atomically replace the session file"""
+        with self.lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp = self.path.with_suffix('.tmp')
+                temp.write_text(data, encoding='utf-8')
+                os.replace(temp, self.path)
+            except OSError:
+                pass  # the session is a convenience; never interrupt editing for it
+
+    @classmethod
+    def add_recent(cls, items, item):
+        """Move an item to the front of a most-recently-used list"""
+        if item in items:
+            items.remove(item)
+        items.insert(0, item)
+        del items[cls.MAX_RECENT:]
+        return items
@@ -40,9 +40,16 @@ class StatusBar(tk.Frame):
         tk.Label(self, text='Words:', anchor=tk.W).pack(side=tk.LEFT)
         tk.Label(self, textvariable=self.word_var, anchor=tk.W).pack(side=tk.LEFT)        
 
+        # Messages from background tasks
+        self.message_var = tk.StringVar()
+        tk.Label(self, textvariable=self.message_var, anchor=tk.E).pack(side=tk.RIGHT)
+
+        # Character and word counts read the whole buffer and can be turned off for huge files
+        self.count_enabled = True
+
         # Event binding
-        self.text.bind("<KeyRelease>", self.update_status)
-        self.text.bind("<ButtonRelease-1>", self.update_status)
+        self.text.bind("<KeyRelease>", self.update_status, add='+')
+        self.text.bind("<ButtonRelease-1>", self.update_status, add='+')
         self.update_status() # set initial status
         self.pack(side=tk.BOTTOM, fill=tk.X, padx=2, pady=2)        
 
@@ -52,16 +59,31 @@ class StatusBar(tk.Frame):
         self.line_var.set(line)
         self.col_var.set(col)
 
+        if not self.count_enabled:
+            return
+
         raw_text = self.text.get('1.0', tk.END)
         spaces = raw_text.count(' ')
 
         char_count = "{:,d}".format(len(raw_text)-spaces)
         self.char_var.set(char_count)
 
-        word_list = [char for char in raw_text.split(' ') if char not in (' ', '', '\n')]
-        word_count = "{:,d}".format(len(word_list))
+        word_count = "{:,d}".format(len(raw_text.split()))
         self.word_var.set(word_count)
 
+    def set_message(self, message=''):
+        """Show a message from a background task on the right side of the status bar"""
+        self.message_var.set(message)
+
+    def set_counting(self, enabled):
+        """Enable or disable the per-keystroke character and word counts"""
+        self.count_enabled = enabled
+        if enabled:
+            self.update_status()
+        else:
+            self.char_var.set('-')
+            self.word_var.set('-')
+
 
 class TestWindow(tk.Tk):
     """A window used for testing the various module dialogs"""
@@ -0,0 +1,246 @@
+"""
+    JSON formatting and a virtualized table view for large CSV files
+"""
+import io
+import re
+import csv
+import json
+import time
+import array
+import pathlib
+import tkinter as tk
+from tkinter import ttk
+from widgets.worker import run_in_thread
+
+JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\],:]|[^\s{}\[\],:"]+')
+OPENERS = {'{', '['}
+CLOSERS = {'}', ']'}
+SNIFF_SIZE = 64 << 10  # bytes used to detect the CSV dialect
+
+
+def format_json(text, indent=4):
+    """Validate JSON text and return it pretty-printed, or minified when `indent` is None
+
+    The text is validated with the json module (a JSONDecodeError carries the line and column of the
+    problem), then re-emitted token by token so that numbers and string escapes are kept exactly as
+    they were written rather than round-tripped through Python objects.
+    """
+    json.loads(text)
+    out = []
+    depth = 0
+    previous = None
+    for match in JSON_TOKEN_RE.finditer(text):
+        token = match.group()
+        if indent is None:
+            out.append(token)
+        elif token in CLOSERS:
+            depth -= 1
+            if previous not in OPENERS:
+                out.append('\n' + ' ' * indent * depth)
+            out.append(token)
+        elif token == ',':
+            out.append(',\n' + ' ' * indent * depth)
+        elif token == ':':
+            out.append(': ')
+        else:
+            if previous in OPENERS:
+                out.append('\n' + ' ' * indent * depth)
+            out.append(token)
+            if token in OPENERS:
+                depth += 1
+        previous = token
+    return ''.join(out)
+
+
+def index_rows(file, dialect=csv.excel):
+    """Return an array with the byte offset of every CSV row, and the file size
+
+    Physical lines are read in binary. A quote character only opens a quoted field at the start of
+    a field, as it does for csv.reader, and a row continues onto the next line while such a field is
+    open, which handles quoted fields that contain newlines. Doubled quotes inside a quoted field are
+    understood; an escapechar is not.
+    """
+    quote = dialect.quotechar.encode('utf-8') if dialect.quotechar else None
+    delimiter = dialect.delimiter.encode('utf-8')
+    offsets = array.array('Q', [0])
+    position = 0
+    quoted = False
+    with open(file, 'rb') as f:
+        for line in f:
+            position += len(line)
+            if quote is not None and (quoted or quote in line):
+                quoted = scan_quotes(line, quote, delimiter, quoted)
+            if not quoted:
+                offsets.append(position)
+    if offsets[-1] == position and len(offsets) > 1:
+        offsets.pop()  # no row starts at the end of the file
+    return offsets, position
+
+
+def scan_quotes(line, quote, delimiter, quoted):
+    """Return True if a quoted field is still open at the end of a line of CSV bytes"""
+    pos = 0
+    field_start = not quoted
+    while pos < len(line):
+        if quoted:
+            pos = line.find(quote, pos)
+            if pos == -1:
+                return True
+            if line.startswith(quote, pos + 1):
+                pos += 2  # a doubled quote stands for the character itself
+            else:
+                quoted, field_start = False, False
+                pos += 1
+        elif field_start and line.startswith(quote, pos):
+            quoted = True
+            pos += 1
+        else:
+            pos = line.find(delimiter, pos)
+            if pos == -1:
+                return False
+            field_start = True
+            pos += 1
+    return quoted
+
+
+class CsvView(tk.Toplevel):
+    """Browse a CSV file as a table without loading it into memory
+
+    Row offsets are indexed once in a worker thread; the table then only reads and parses the rows
+    that are on screen, so the size of the file has no effect on scrolling.
+    """
+
+    def __init__(self, master, file):
+        super().__init__(master)
+        self.file = pathlib.Path(file)
+        self.title(f'{self.file.name} - Table View')
+        self.transient(master)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.geometry('900x500')
+
+        # table variables
+        self.offsets = array.array('Q')
+        self.size = 0
+        self.top = 0
+        self.rows = 25
+        with open(self.file, 'rb') as f:
+            sample = f.read(SNIFF_SIZE).decode('utf-8', errors='replace')
+        try:
+            self.dialect = csv.Sniffer().sniff(sample)
+        except csv.Error:
+            self.dialect = csv.excel
+        header = next(csv.reader(io.StringIO(sample), self.dialect), [])
+        self.columns = [f'#{i}' for i in range(len(header))]
+
+        # create widgets
+        self.frame = tk.Frame(self)
+        self.table = ttk.Treeview(self.frame, columns=self.columns, show='headings', height=self.rows,
+                                  selectmode=tk.BROWSE)
+        for column, name in zip(self.columns, header):
+            self.table.heading(column, text=name, anchor=tk.W)
+            self.table.column(column, width=120, stretch=False)
+        self.yscroll = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.xscroll = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.table.xview)
+        self.table.configure(xscrollcommand=self.xscroll.set)
+        self.status_var = tk.StringVar()
+        self.status_var.set('Indexing rows...')
+        status = tk.Label(self, textvariable=self.status_var, anchor=tk.W)
+
+        # pack widgets to window
+        self.yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=tk.YES)
+        self.frame.pack(fill=tk.BOTH, expand=tk.YES, padx=5, pady=5)
+        status.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        # event binding
+        self.table.bind("<MouseWheel>", lambda event: self.yview('scroll', -event.delta // 120, 'units'))
+        self.table.bind("<Button-4>", lambda event: self.yview('scroll', -3, 'units'))
+        self.table.bind("<Button-5>", lambda event: self.yview('scroll', 3, 'units'))
+        self.table.bind("<Configure>", self.on_resize)
+        self.bind("<Prior>", lambda event: self.yview('scroll', -1, 'pages'))
+        self.bind("<Next>", lambda event: self.yview('scroll', 1, 'pages'))
+        self.bind("<Home>", lambda event: self.yview('moveto', 0))
+        self.bind("<End>", lambda event: self.yview('moveto', 1))
+
+        self.started = time.perf_counter()
+        run_in_thread(self, index_rows, (self.file, self.dialect), self.on_indexed, self.on_error)
+
+    @property
+    def row_count(self):
+        """Number of data rows, not counting the header"""
+        return max(0, len(self.offsets) - 1)
+
+    def on_indexed(self, result):
+        """Show the table once the row offsets are known"""
+        self.offsets, self.size = result
+        self.status_var.set(f'{self.row_count:,d} rows, indexed in {time.perf_counter() - self.started:.2f}s')
+        self.render()
+
+    def on_error(self, error):
+        """Report a file that could not be indexed"""
+        self.status_var.set(f'Could not read {self.file.name}: {error}')
+
+    def on_resize(self, event=None):
+        """Fit the number of rendered rows to the window height"""
+        style = ttk.Style(self)
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        rows = max(1, (self.table.winfo_height() - row_height) // row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.table.configure(height=rows)
+            self.render()
+
+    def yview(self, action, amount=None, unit=None):
+        """Scroll command of the vertical scrollbar"""
+        if action == 'moveto':
+            self.top = int(float(amount) * self.row_count)
+        elif unit == 'pages':
+            self.top += int(amount) * self.rows
+        else:
+            self.top += int(amount)
+        self.render()
+
+    def read_rows(self, first, count):
+        """Read and parse `count` data rows starting at `first`"""
+        start = self.offsets[first + 1]
+        last = first + 1 + count
+        end = self.offsets[last] if last < len(self.offsets) else self.size
+        with open(self.file, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start).decode('utf-8', errors='replace')
+        return list(csv.reader(io.StringIO(data, newline=''), self.dialect))
+
+    def render(self):
+        """Replace the table rows with the rows currently in view"""
+        self.top = max(0, min(self.top, self.row_count - self.rows))
+        self.table.delete(*self.table.get_children())
+        if self.row_count:
+            for row in self.read_rows(self.top, min(self.rows, self.row_count - self.top)):
+                self.table.insert('', tk.END, values=row)
+            first = self.top / self.row_count
+            self.yscroll.set(first, first + self.rows / self.row_count)
+
+    def close(self):
+        """Close window"""
+        self.master.focus_set()
+        self.destroy()
+
+
+class TestWindow(tk.Tk):
+    """A window used for testing the various module dialogs"""
+    def __init__(self):
+        super().__init__()
+        self.title('Testing Window')
+        self.text = tk.Text(self)
+        self.text.pack(fill=tk.BOTH, expand=tk.YES)
+        self.text.insert(tk.END, format_json('{"numbers": [1.10, 2e5, -0], "empty": {}, "text": "a\\"b"}'))
+
+
+if __name__ == '__main__':
+
+    w = TestWindow()
+    file = pathlib.Path('test.csv')
+    if file.is_file():
+        CsvView(w, file)
+    w.mainloop()
@@ -5,14 +5,17 @@
     Modified: 2020-06-08
 """
 import tkinter as tk
+from tkinter.ttk import Combobox
+from widgets.session import Session
 
 
 class Find(tk.Toplevel):
     """Find whole or partial words within a text widget"""
 
-    def __init__(self, master, text_widget):
+    def __init__(self, master, text_widget, history=None):
         super().__init__(master)
         self.text = text_widget
+        self.history = [] if history is None else history
         self.title('Find')
         self.transient(master)
         self.resizable(False, False)
@@ -22,7 +25,7 @@ class Find(tk.Toplevel):
 
         # create widgets
         lbl = tk.Label(self, text='Find what:')
-        self.text_find = tk.Entry(self, width=30, font='-size 10')
+        self.text_find = Combobox(self, width=30, font='-size 10', values=self.history)
         self.btn_next = tk.Button(self, text='Find Next', width=10, command=self.ask_find_match)
         self.whole_word_var = tk.IntVar()
         self.whole_word_var.set(0)
@@ -75,11 +78,18 @@ class Find(tk.Toplevel):
             return
         if self.term != term:
             self.term = term
+            self.remember_term(term)
             self.chars = len(term)
             self.text.tag_remove('found', '1.0', tk.END)
             self.route_match()
         self.highlight_next_match()
 
+    def remember_term(self, term):
+        """Add the search term to the recent search history"""
+        Session.add_recent(self.history, term)
+        self.text_find.configure(values=self.history)
+        self.master.event_generate('<<FindHistoryChanged>>')
+
     def route_match(self):
         """Direct to whole or partial match"""
         if self.whole_word_var.get():
@@ -130,9 +140,10 @@ class Find(tk.Toplevel):
 class Replace(tk.Toplevel):
     """Find and replace words within a text widget"""
 
-    def __init__(self, master, text_widget):
+    def __init__(self, master, text_widget, history=None):
         super().__init__(master)
         self.text = text_widget
+        self.history = [] if history is None else history
         self.title('Find and Replace')
         self.transient(master)
         self.resizable(False, False)
@@ -142,7 +153,7 @@ class Replace(tk.Toplevel):
 
         # create widgets
         lbl1 = tk.Label(self, text='Find what:', anchor=tk.W)
-        self.text_find = tk.Entry(self, width=30, font='-size 10')
+        self.text_find = Combobox(self, width=30, font='-size 10', values=self.history)
         self.text_find.focus_set()
         self.btn_next = tk.Button(self, text='Find Next', width=12, command=self.ask_find_match)
 
@@ -205,11 +216,18 @@ class Replace(tk.Toplevel):
             return
         if self.term != term:
             self.term = term
+            self.remember_term(term)
             self.chars = len(term)
             self.text.tag_remove('found', '1.0', tk.END)
             self.route_match()
         self.highlight_next_match()
 
+    def remember_term(self, term):
+        """Add the search term to the recent search history"""
+        Session.add_recent(self.history, term)
+        self.text_find.configure(values=self.history)
+        self.master.event_generate('<<FindHistoryChanged>>')
+
     def route_match(self):
         """Direct to whole or partial match"""
         if self.whole_word_var.get():
@@ -258,6 +276,7 @@ class Replace(tk.Toplevel):
 
     def find_replace_next(self):
         """Find the next available match and replace it"""
+        self.master.event_generate('<<BeforeReplace>>')  # lets the editor finish pending edits
         old_term = self.text_find.get()
         new_term = self.text_replace.get()
         start = self.text.search(old_term, tk.INSERT, tk.END)
@@ -269,6 +288,7 @@ class Replace(tk.Toplevel):
 
     def find_replace_all(self):
         """Find all matches and replace"""
+        self.master.event_generate('<<BeforeReplace>>')  # lets the editor finish pending edits
         old_term = self.text_find.get()
         new_term = self.text_replace.get()
         while True:
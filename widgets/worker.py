@@ -0,0 +1,55 @@
+"""
+    Run slow functions in a worker thread and hand the result back to the Tk event loop
+"""
+import queue
+import threading
+
+
+def run_in_thread(master, func, args=(), callback=None, errback=None, interval=50):
+    """Call `func(*args)` in a worker thread and return the thread
+
+    Tk may only be used from the main thread, so the worker never touches widgets; the result is
+    polled from the event loop and passed to `callback` (or the exception to `errback`) there. The
+    returned thread has a `finish` method that waits for the worker and hands the result over
+    straight away, for when the event loop will not run again (e.g. on quit); it returns True if
+    `func` succeeded.
+    """
+    results = queue.Queue()
+    outcome = None
+
+    def work():
+        try:
+            results.put((True, func(*args)))
+        except Exception as error:
+            results.put((False, error))
+
+    def deliver():
+        nonlocal outcome
+        if outcome is None:
+            try:
+                ok, value = results.get_nowait()
+            except queue.Empty:
+                return False
+            outcome = ok
+            if ok and callback:
+                callback(value)
+            elif not ok:
+                if errback is None:
+                    raise value
+                errback(value)
+        return True
+
+    def poll():
+        if not deliver():
+            master.after(interval, poll)
+
+    def finish():
+        thread.join()
+        deliver()
+        return outcome
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.finish = finish
+    thread.start()
+    master.after(interval, poll)
+    return thread